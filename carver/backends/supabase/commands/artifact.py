@@ -11,7 +11,7 @@ import click
 
 from tabulate import tabulate
 
-from ..utils.helpers import topological_sort
+from ..utils.helpers import topological_sort, table_format_option
 from ..utils import get_spec_config
 from carver.utils import format_datetime, parse_date_filter
 from .artifact_manager import ArtifactManager
@@ -130,10 +130,7 @@ def bulk_generate(ctx, spec_id: int, source_id: int, last: Optional[str], genera
 @click.option('--last', type=str, help='Filter by time window (e.g. "1d", "2h", "30m")')
 @click.option('--offset', default=0, type=int, help='Offset for search results')
 @click.option('--limit', default=100, type=int, help='Maximum number of posts to fetch')
-@click.option('--format', 'output_format',
-              type=click.Choice(['table', 'grid', 'pipe', 'orgtbl', 'rst', 'mediawiki', 'html']),
-              default='table',
-              help='Output format for display')
+@table_format_option(help='Output format for display')
 @click.option('--dump', 'dump_format',
               type=click.Choice(['text', 'csv', 'json']),
               help='Dump results to file in specified format')
@@ -312,10 +309,7 @@ def deactivate(ctx, spec_id: int, artifacts: str):
 
 @artifact.command()
 @click.option('--id', required=True, type=int, help='Artifact ID to display')
-@click.option('--format', 'output_format',
-              type=click.Choice(['table', 'grid', 'pipe', 'orgtbl', 'rst', 'mediawiki', 'html']),
-              default='grid',
-              help='Output format for display')
+@table_format_option(default='grid', help='Output format for display')
 @click.pass_context
 def show(ctx, id: int, output_format: str):
     """Show details for a specific artifact."""
@@ -4,12 +4,13 @@ import json
 import traceback
 import time
 import logging
+import heapq
 
 from typing import List, Dict, Any, Optional, Type
 from datetime import datetime
 from abc import ABC, abstractmethod
 
-from carver.llm import get_embedding
+from carver.llm import get_embedding, get_embeddings
 from carver.generators import ArtifactGeneratorFactory
 
 logger = logging.getLogger(__name__)
@@ -95,6 +96,7 @@ class ArtifactManager:
         generator_ids = generator.get_ids(spec['config'])
 
         artifacts_to_create = []
+        texts_to_embed = []
         errors = []
         newartifacts = False
         completelist = set()
@@ -139,23 +141,17 @@ class ArtifactManager:
 
                     completelist.add(rec)
 
-                    # Generate embedding for content
-                    try:
-                        text = ""
-                        if 'name' in artifact_data and artifact_data['name']:
-                            text += artifact_data['name'] + "\n"
+                    # Text to embed. Embeddings are requested in one
+                    # batch when the artifacts are written.
+                    text = ""
+                    if 'name' in artifact_data and artifact_data['name']:
+                        text += artifact_data['name'] + "\n"
 
-                        if 'title' in artifact_data and artifact_data['title'] not in text:
-                            text += artifact_data['title'] + "\n"
+                    if 'title' in artifact_data and artifact_data['title'] not in text:
+                        text += artifact_data['title'] + "\n"
 
-                        text += artifact_data['content']
-                        text = text[:max_content_size]
-                        content_embedding = get_embedding(text)
-                    except Exception as e:
-                        traceback.print_exc()
-                        print(f"Error generating embedding: {str(e)}")
-                        content_embedding = None
-                        continue
+                    text += artifact_data['content']
+                    text = text[:max_content_size]
 
                     artifact = {
                         'active': True,
@@ -168,7 +164,7 @@ class ArtifactManager:
                         'artifact_type':  artifact_data['artifact_type'],
                         'description':    artifact_data.get('description'),
                         'content':        artifact_data['content'],
-                        'content_embedding': content_embedding,
+                        'content_embedding': None,
                         'format':         artifact_data.get('format', 'text'),
                         'language':       artifact_data.get('language', 'en'),
                         'status':         'draft',
@@ -182,12 +178,15 @@ class ArtifactManager:
                     # print(artifact['content'])
 
                     artifacts_to_create.append(artifact)
+                    texts_to_embed.append(text)
                     newartifacts = True
                     print(f"[{idx}] Adding", rec, "Total", len(artifacts_to_create))
 
                 if idx > 0 and idx % 10 == 0:
                     print(f"[posts: {idx}] New artifacts to create {len(artifacts_to_create)}")
                     if newartifacts:
+                        artifacts_to_create = self._embed_artifacts(artifacts_to_create,
+                                                                    texts_to_embed)
                         inc_created = self.db.artifact_bulk_create(artifacts_to_create)
                         created += inc_created
                         print(f"[posts: {idx}] Created {len(inc_created)}")
@@ -199,6 +198,7 @@ class ArtifactManager:
                             postmap[a['post_id']]['artifacts'].append(a)
 
                         artifacts_to_create = []
+                        texts_to_embed = []
                         if delay > 0:
                             time.sleep(delay)
                         newartifacts = False
@@ -207,6 +207,8 @@ class ArtifactManager:
                 errors.append(f"Error processing post {post_id}: {str(e)}"[:100])
 
         if newartifacts:
+            artifacts_to_create = self._embed_artifacts(artifacts_to_create,
+                                                        texts_to_embed)
             inc_created = self.db.artifact_bulk_create(artifacts_to_create)
             created += inc_created
             print(f"[posts: {idx}] Created {len(inc_created)}")
@@ -216,6 +218,34 @@ class ArtifactManager:
 
         return created
 
+    def _embed_artifacts(self, artifacts: List[Dict[str, Any]],
+                         texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fill in content_embedding for the artifacts with one embedding
+        request. If the batch request fails each text is embedded on
+        its own, and artifacts that still fail are dropped.
+        """
+        try:
+            embeddings = get_embeddings(texts)
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {str(e)}")
+            embeddings = []
+            for text in texts:
+                try:
+                    embeddings.append(get_embedding(text))
+                except Exception as e:
+                    traceback.print_exc()
+                    print(f"Error generating embedding: {str(e)}")
+                    embeddings.append(None)
+
+        embedded = []
+        for artifact, embedding in zip(artifacts, embeddings):
+            if embedding is None:
+                continue
+            artifact['content_embedding'] = embedding
+            embedded.append(artifact)
+        return embedded
+
     def artifact_regenerate(self, artifact_id: int) -> Dict[str, Any]:
         """Regenerate a single artifact"""
         # Get existing artifact
@@ -316,10 +346,11 @@ class ArtifactManager:
                 logger.warning("No artifacts found to activate")
                 return []
 
+            now = datetime.utcnow().isoformat()
             updates = [{
                 'id': artifact_id,
                 'active': True,
-                'updated_at': datetime.utcnow().isoformat()
+                'updated_at': now
             } for artifact_id in artifact_ids]
 
             return self.artifact_bulk_update(updates)
@@ -444,7 +475,7 @@ class ArtifactManager:
                         total_errors += 1
                         continue
 
-                print("Computed. Posting batch", i, i+batch_size)
+                logger.debug("Computed. Posting batch %d-%d", i, i+batch_size)
                 # Bulk update the batch
                 if batch_updates:
                     try:
@@ -456,7 +487,7 @@ class ArtifactManager:
                         total_errors += len(batch_updates)
 
                 total_processed += len(batch)
-                print("Completed batch", i, i+batch_size)
+                logger.debug("Completed batch %d-%d", i, i+batch_size)
 
             return {
                 'processed': total_processed,
@@ -491,3 +522,37 @@ class ArtifactManager:
         except Exception as e:
             print(f"Error in similarity search: {str(e)}")
             raise
+
+    def artifact_search_similar_multi(self,
+                                      query: str,
+                                      spec_ids: List[int],
+                                      match_threshold: float = 0.7,
+                                      match_count: int = 10,
+                                      status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Search for similar artifacts across several specifications. The
+        query is embedded once and the best match_count results overall
+        are returned, most similar first.
+        """
+        try:
+            # Generate embedding for query
+            query_embedding = get_embedding(query)
+
+            all_results = []
+            for spec_id in spec_ids:
+                results = self.db.artifact_search_similar(
+                    query_embedding,
+                    match_threshold=match_threshold,
+                    match_count=match_count,
+                    spec_id=spec_id,
+                    status=status
+                )
+                logger.debug("Spec %s: found %d", spec_id, len(results))
+                all_results.extend(results)
+
+            return heapq.nlargest(match_count, all_results,
+                                  key=lambda x: x['similarity'])
+
+        except Exception as e:
+            logger.error(f"Error in similarity search: {str(e)}")
+            raise
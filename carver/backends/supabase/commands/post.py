@@ -1,19 +1,29 @@
 import os
 import sys
 import json
+import logging
 import click
 from typing import Optional
 from datetime import datetime
 import traceback
 from tabulate import tabulate
 
-from carver.utils import format_datetime, parse_date_filter
+from carver.utils import format_datetime, parse_date_filter, json_dumps
+from ..utils.helpers import echo_table, table_format_option
 from .post_manager import PostManager
 
+# Columns rendered by the search command
+SEARCH_FIELDS = ['id', 'content_identifier', 'source_id', 'title', 'content_type',
+                 'author', 'active', 'is_processed', 'published_at', 'updated_at',
+                 'carver_source']
+
 @click.group()
+@click.option('--verbose', is_flag=True, help='Show debug logs')
 @click.pass_context
-def post(ctx):
+def post(ctx, verbose: bool):
     """Manage posts in the system."""
+    if verbose:
+        logging.getLogger('carver').setLevel(logging.DEBUG)
     ctx.obj['post_manager'] = PostManager(ctx.obj['supabase'])
 
 @post.command()
@@ -77,10 +87,7 @@ def deactivate_by_content(ctx, source_id: int, identifiers: str):
 @click.option('--tags-search', help='Search in tags')
 @click.option('--limit', type=int, default=20, help='Number of posts to return')
 @click.option('--offset', type=int, default=0, help='Number of posts to skip')
-@click.option('--format', 'output_format',
-              type=click.Choice(['table', 'grid', 'pipe', 'orgtbl', 'rst', 'mediawiki', 'html']),
-              default='table',
-              help='Output format for the table')
+@table_format_option()
 @click.pass_context
 def search(ctx, source_id: Optional[int], content_type: Optional[str],
            author: Optional[str], active: Optional[bool], processed: Optional[bool],
@@ -96,7 +103,7 @@ def search(ctx, source_id: Optional[int], content_type: Optional[str],
         acquired_since_dt = parse_date_filter(acquired_since) if acquired_since else None
 
         # Search posts
-        posts = db.post_search(
+        posts, total = db.post_search(
             source_id=source_id,
             content_type=content_type,
             author=author,
@@ -106,8 +113,10 @@ def search(ctx, source_id: Optional[int], content_type: Optional[str],
             acquired_since=acquired_since_dt,
             title_search=title_search,
             tags_search=tags_search,
+            fields=SEARCH_FIELDS,
             limit=limit,
-            offset=offset
+            offset=offset,
+            return_count=True
         )
 
         if posts:
@@ -116,29 +125,33 @@ def search(ctx, source_id: Optional[int], content_type: Optional[str],
                        # "Content ID",
                        'Source', 'Title', 'Type', 'Author',
                        'A', 'P', 'Published', 'Updated']
-            rows = []
-
-            for post in posts:
-                source_name = post['carver_source']['name'] if post.get('carver_source') else 'N/A'
-                rows.append([
-                    post['id'],
-                    #post['content_identifier'][-20:],
-                    f"{source_name[:12]} ({post['source_id']})",
-                    post['title'][:30] + ('...' if len(post.get('title', '')) > 50 else ''),
-                    post['content_type'],
-                    post.get('author', 'N/A')[:20],
-                    '✓' if post['active'] else '✗',
-                    '✓' if post['is_processed'] else '✗',
-                    format_datetime(post['published_at']) if post.get('published_at') else 'N/A',
-                    format_datetime(post['updated_at'])
-                ])
+
+            def generate_rows():
+                for post in posts:
+                    carver_source = post.get('carver_source')
+                    source_name = carver_source['name'] if carver_source else 'N/A'
+                    title = post.get('title') or ''
+                    author = post.get('author') or 'N/A'
+                    published_at = post.get('published_at')
+                    yield [
+                        post['id'],
+                        #post['content_identifier'][-20:],
+                        f"{source_name[:12]} ({post['source_id']})",
+                        title[:30] + ('...' if len(title) > 50 else ''),
+                        post['content_type'],
+                        author[:20],
+                        '✓' if post['active'] else '✗',
+                        '✓' if post['is_processed'] else '✗',
+                        format_datetime(published_at) if published_at else 'N/A',
+                        format_datetime(post['updated_at'])
+                    ]
 
             # Print table
             click.echo("Note: A = Active, P=Processed")
-            click.echo(tabulate(rows, headers=headers, tablefmt=output_format))
-            click.echo(f"\nTotal posts: {len(posts)}")
-            if len(posts) == limit:
-                click.echo(f"Note: Result limit reached. Use --offset {offset + limit} to see more.")
+            echo_table(generate_rows(), headers=headers, tablefmt=output_format)
+            click.echo(f"\nTotal posts: {len(posts)} of {total}")
+            if offset + len(posts) < total:
+                click.echo(f"Note: More posts available. Use --offset {offset + len(posts)} to see more.")
         else:
             click.echo("No posts found")
 
@@ -203,12 +216,12 @@ def show(ctx, post_id: int):
         # Content metrics
         if post.get('content_metrics'):
             click.echo("\n=== Content Metrics ===")
-            click.echo(json.dumps(post['content_metrics'], indent=2))
+            click.echo(json_dumps(post['content_metrics']))
 
         # Analysis metadata
         if post.get('analysis_metadata'):
             click.echo("\n=== Analysis Metadata ===")
-            click.echo(json.dumps(post['analysis_metadata'], indent=2))
+            click.echo(json_dumps(post['analysis_metadata']))
 
         # Tags and categories
         if post.get('tags') or post.get('categories'):
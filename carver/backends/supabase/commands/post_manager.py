@@ -1,155 +1,360 @@
 import os
 import sys
 import json
-
-from typing import List, Dict, Any, Optional, Tuple
+import time
+import logging
+import hashlib
+
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterable, Set
+from itertools import islice, count
+from operator import itemgetter
+from functools import lru_cache
 from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from dateutil import parser as dateparser
 
 from carver.feeds.base import FeedReader
+from carver.utils import chunks, chunks_by_length, json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+# Fields that decide whether a synced post has changed
+TRACKED_FIELDS = ('title', 'published_at')
+
+# Columns needed to diff incoming posts against stored ones. The stored
+# analysis_metadata holds the hash and is merged into on write, so that
+# metadata added by other tools is preserved.
+SYNC_FIELDS = ['id', 'content_identifier', 'title', 'published_at',
+               'analysis_metadata']
+
+# Columns written back for a changed post
+UPDATE_FIELDS = ('name', 'title', 'published_at', 'analysis_metadata', 'updated_at')
+
+def compute_sync_hash(post: Dict[str, Any]) -> str:
+    """
+    Digest of the tracked fields used for change detection. Stored in
+    analysis_metadata so unchanged posts can be skipped on later syncs.
+    """
+    data = {k: post.get(k) for k in TRACKED_FIELDS}
+    text = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+@lru_cache(maxsize=4096)
+def _parse_dt(value: Any) -> Optional[datetime]:
+    """
+    Parse a timestamp, trying the fast ISO-8601 parser before falling
+    back to dateutil for other formats. Results are cached since stored
+    timestamps repeat across batches and syncs.
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return dateparser.parse(value)
 
 class PostManager:
     """Manages post operations including sync with feeds"""
 
-    def __init__(self, db_client):
+    def __init__(self, db_client, source_ttl: int = 60,
+                 use_disk_cache: bool = False):
         self.db = db_client
+        self.source_ttl = source_ttl
+        # When set, lookups go through the client's disk cache so that
+        # later invocations can reuse them
+        self.use_disk_cache = use_disk_cache
+        self._source_cache = {}
+
+    def get_source(self, source_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a source, reusing a recent lookup if one is cached.
+        Entries expire after source_ttl seconds.
+        """
+        cached = self._source_cache.get(source_id)
+        if cached is not None and (time.monotonic() - cached[0]) < self.source_ttl:
+            return cached[1]
+
+        source = self.db.source_get(source_id, use_cache=self.use_disk_cache)
+
+        if source:
+            self._source_cache[source_id] = (time.monotonic(), source)
+        return source
+
+    def invalidate_source(self, source_id: int):
+        """
+        Drop a source looked up by this manager after it has been
+        modified. The client removes the disk cache entry on write.
+        """
+        self._source_cache.pop(source_id, None)
 
     def sync_posts(self, source_id: int,
                   fields: Optional[List[str]] = None,
-                  max_results: Optional[int] = None) -> Tuple[int, int]:
+                  max_results: Optional[int] = None,
+                  batch_size: int = 1000) -> Tuple[int, int]:
         """
-        Sync posts for a source
+        Sync posts for a source. Posts are written in bulk, batch_size
+        posts at a time.
         Returns tuple of (posts_added, posts_updated)
         """
 
-        print("sync_posts", max_results)
+        logger.debug("sync_posts source=%s max_results=%s", source_id, max_results)
 
-        now = datetime.utcnow().isoformat()
+        reader = self._get_reader(source_id, max_results)
 
-        # Get source information
-        source = self.db.source_get(source_id)
+        # Read feed
+        new_posts = reader.read()
+
+        return self._apply_sync(source_id, reader, new_posts, fields,
+                                batch_size=batch_size)
+
+    def sync_posts_many(self, source_ids: List[int],
+                        fields: Optional[List[str]] = None,
+                        max_results: Optional[int] = None,
+                        max_workers: int = 8,
+                        batch_size: int = 1000) -> Dict[int, Union[Tuple[int, int], Exception]]:
+        """
+        Sync posts for several sources. Feeds are read in parallel and
+        the results are written to the database from the calling thread.
+
+        Returns a map of source_id -> (posts_added, posts_updated), or
+        the exception raised while syncing that source.
+        """
+        results = {}
+
+        # Source lookups stay on this thread along with all other
+        # database access
+        readers = {}
+        for source_id in source_ids:
+            try:
+                readers[source_id] = self._get_reader(source_id, max_results)
+            except Exception as e:
+                logger.error(f"Error preparing source {source_id}: {str(e)}")
+                results[source_id] = e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(reader.read): source_id
+                for source_id, reader in readers.items()
+            }
+            for future in as_completed(futures):
+                source_id = futures[future]
+                try:
+                    results[source_id] = self._apply_sync(source_id,
+                                                          readers[source_id],
+                                                          future.result(),
+                                                          fields,
+                                                          batch_size=batch_size)
+                except Exception as e:
+                    logger.error(f"Error syncing source {source_id}: {str(e)}")
+                    results[source_id] = e
+
+        return results
+
+    def _get_reader(self, source_id: int, max_results: Optional[int] = None) -> FeedReader:
+        """Get the feed reader for a source"""
+        source = self.get_source(source_id)
         if not source:
             raise ValueError(f"Source {source_id} not found")
 
         # Get appropriate reader with max_results
-        reader = FeedReader.get_reader(source, max_results)
+        return FeedReader.get_reader(source, max_results)
 
-        # Get existing posts
-        existing_posts = self.db.post_search(
-            source_id=source_id,
-            limit=10000,
-            active=True,
-            fields=fields or ['id', 'content_identifier', 'updated_at', 'title', 'description', 'published_at']
-        )
+    def _get_existing_posts(self, source_id: int,
+                            content_ids: List[str],
+                            fields: Optional[List[str]] = None,
+                            chunk_size: int = 200) -> List[Dict[str, Any]]:
+        """
+        Fetch stored posts matching the content identifiers, active or
+        not, so a deactivated post is not written again as a new one.
+        Lookups are chunked by encoded length to keep the IN filter
+        within URL length limits.
+        """
+        existing_posts = []
+        for chunk in chunks_by_length(content_ids, max_items=chunk_size):
+            existing_posts.extend(self.db.post_search(
+                source_id=source_id,
+                content_identifier=chunk,
+                fields=fields or SYNC_FIELDS,
+                limit=len(chunk)
+            ))
+        return existing_posts
+
+    def _apply_sync(self, source_id: int,
+                    reader: FeedReader,
+                    new_posts: Iterable[Dict[str, Any]],
+                    fields: Optional[List[str]] = None,
+                    batch_size: int = 1000) -> Tuple[int, int]:
+        """
+        Diff posts read from the feed against stored posts and write
+        the changes. Posts are consumed in batches so only one batch of
+        payloads is held at a time.
+        Returns tuple of (posts_added, posts_updated)
+        """
+        added = 0
+        updated = 0
+        seen = set()
+
+        posts_iter = iter(new_posts)
+        while True:
+            batch = list(islice(posts_iter, batch_size))
+            if not batch:
+                break
+            batch_added, batch_updated = self._sync_batch(source_id, reader, batch,
+                                                          seen, fields)
+            added += batch_added
+            updated += batch_updated
 
-        # Create lookup of existing posts
-        existing_map = {
-            post['content_identifier']: post
-            for post in existing_posts
-        }
+        # Update source last_crawled timestamp
+        reader.update_source_metadata(self.db)
+        self.invalidate_source(source_id)
 
-        print("Existing map", len(existing_map))
+        return added, updated
 
-        # Read feed
-        new_posts = reader.read()
+    def _sync_batch(self, source_id: int,
+                    reader: FeedReader,
+                    new_posts: List[Dict[str, Any]],
+                    seen: Set[str],
+                    fields: Optional[List[str]] = None) -> Tuple[int, int]:
+        """
+        Diff and write one batch of feed posts. seen carries the content
+        identifiers of earlier batches so duplicates are skipped.
+        Returns tuple of (posts_added, posts_updated)
+        """
+        # Normalize and hash the new posts of this batch
+        posts = []
+        for idx, post in enumerate(new_posts):
 
-        print("new_posts", len(new_posts))
-        # Split into updates and creates
-        to_create = []
-        to_update = []
+            # Ensure that there are no duplicates
+            content_id = post['content_identifier']
+            if content_id in seen:
+                logger.debug("[%d] Duplicate %s", idx, content_id)
+                continue
+            seen.add(content_id)
 
-        seen = {}
+            # Normalize before hashing so that the truncated values
+            # match what is stored
+            reader.normalize_item(post)
 
-        for idx, post in enumerate(new_posts):
+            sync_hash = compute_sync_hash(post)
+            post['analysis_metadata'] = {
+                **(post.get('analysis_metadata') or {}),
+                'sync_hash': sync_hash
+            }
+            posts.append(post)
 
-            if 'created_at' not in post:
-                post['created_at'] = now
+        logger.debug("Posts read from feed: %d", len(posts))
 
-            if 'updated_at' not in post:
-                post['updated_at'] = now
+        # Get existing posts, limited to the ones in this batch
+        content_ids = [post['content_identifier'] for post in posts]
+        existing_posts = self._get_existing_posts(source_id, content_ids, fields)
 
-            # Fix missing columns
-            if 'name' not in post:
-                post['name'] = post['title']
-            post['name'] = post['name'][:255]
-            post['title'] = post['title'][:500]
+        # Index existing posts by content identifier. The columns used
+        # by the diff are kept in parallel lists.
+        existing_index = dict(zip(map(itemgetter('content_identifier'), existing_posts),
+                                  count()))
+        existing_ids = list(map(itemgetter('id'), existing_posts))
+        existing_titles = list(map(itemgetter('title'), existing_posts))
+        existing_dates = list(map(itemgetter('published_at'), existing_posts))
+        existing_metadata = [post.get('analysis_metadata') or {} for post in existing_posts]
+        existing_hashes = [metadata.get('sync_hash') for metadata in existing_metadata]
 
-            # Ensure that there are no duplicates
-            content_id = post['content_identifier']
-            if content_id in seen:
-                print(idx, "Duplicate", content_id)
-                continue
-            seen[content_id] = 1
-
-            # Now continue
-            if 'author' in post and post['author'] and len(post['author']) > 255:
-                post['author'] = post['author'][:255]
-
-            print(idx, "content_id", content_id)
-            if content_id in existing_map:
-                print("in existing_map")
-                d1 = dateparser.parse(post['published_at'])
-                d2 = dateparser.parse(existing_map[content_id]['published_at'])
-                change = ((post['title'] != existing_map[content_id]['title']) or
-                          #(post['description'] != existing_map[content_id]['description']) or
-                          (d1 != d2))
-                #print(post['title'],
-                #       existing_map[content_id]['title'],
-                #       (post['title'] != existing_map[content_id]['title']))
-                # print(d1, d2, (d1 != d2))
-                if change:
-                    post['id'] = existing_map[content_id]['id']
-                    to_update.append(post)
+        logger.debug("Existing posts: %d", len(existing_index))
+
+        # Split into updates and creates
+        to_create = []
+        to_update = []
+
+        to_rehash = []
+
+        date_candidates = []
+
+        def update(post, i):
+            # Send only the tracked columns, not the whole post
+            delta = {'id': existing_ids[i]}
+            for key in UPDATE_FIELDS:
+                delta[key] = post.get(key)
+            delta['analysis_metadata'] = {**existing_metadata[i],
+                                          **post['analysis_metadata']}
+            to_update.append(delta)
+
+        def rehash(post, i):
+            # Unchanged but stored without a matching hash. Record
+            # the hash so the next sync can skip this post, keeping
+            # the rest of the stored metadata.
+            to_rehash.append({
+                'id': existing_ids[i],
+                'analysis_metadata': {
+                    **existing_metadata[i],
+                    'sync_hash': post['analysis_metadata']['sync_hash']
+                }
+            })
+
+        for post in posts:
+            sync_hash = post['analysis_metadata']['sync_hash']
+
+            i = existing_index.get(post['content_identifier'])
+            if i is not None:
+                if existing_hashes[i] == sync_hash:
+                    # Tracked fields are unchanged
+                    continue
+
+                # Compare the tracked fields as one tuple. Dates that
+                # differ as strings are parsed in one pass after the loop.
+                current = (post['title'], post['published_at'])
+                stored = (existing_titles[i], existing_dates[i])
+                if current == stored:
+                    rehash(post, i)
+                elif current[0] != stored[0]:
+                    #(post['description'] != existing['description']) or
+                    update(post, i)
+                else:
+                    date_candidates.append((post, i))
             else:
                 # New post
                 to_create.append(post)
 
-        print(f"To create: {len(to_create)}")
-        print(f"To update: {len(to_update)}")
+        # Parse the dates of posts whose title is unchanged but whose
+        # date strings differ. Feed dates are normalized to the form the
+        # database returns, so this is rare.
+        for post, i in date_candidates:
+            if _parse_dt(post['published_at']) != _parse_dt(existing_dates[i]):
+                update(post, i)
+            else:
+                rehash(post, i)
 
-        # Perform bulk operations
-        created = self.db.post_bulk_create(to_create)
-        updated = self.db.post_bulk_update(to_update)
+        logger.debug("To create: %d", len(to_create))
+        logger.debug("To update: %d", len(to_update))
 
-        # Update source last_crawled timestamp
-        reader.update_source_metadata(self.db)
+        # New posts are matched on (source_id, content_identifier) so a
+        # post stored since the lookup is not duplicated. Changed posts
+        # are patched by id with the tracked columns only.
+        created = self.db.post_bulk_upsert(to_create) if to_create else []
+        updated = self.db.post_bulk_patch(to_update) if to_update else []
+        if to_rehash:
+            self.db.post_bulk_patch(to_rehash)
 
         return len(created), len(updated)
 
+    def _bulk_set_active_by_content(self, source_id: int,
+                                    content_identifiers: List[str],
+                                    active: bool) -> int:
+        """Set the active flag on posts matching the content identifiers"""
+        # Drop duplicate identifiers, keeping the order
+        content_identifiers = list(dict.fromkeys(content_identifiers))
+        updated = self.db.post_bulk_update_flag_by_content(source_id,
+                                                           content_identifiers,
+                                                           active)
+        return len(updated)
+
     def bulk_activate_by_content(self, source_id: int, content_identifiers: List[str]) -> int:
         """Activate multiple posts by their content identifiers"""
-        posts = self.db.post_search(
-            source_id=source_id,
-            fields=['id', 'content_identifier']
-        )
-
-        # Filter posts to update
-        to_update = [
-            {'id': post['id'], 'active': True}
-            for post in posts
-            if post['content_identifier'] in content_identifiers
-        ]
-
-        updated = self.db.post_bulk_update(to_update)
-        return len(updated)
+        return self._bulk_set_active_by_content(source_id, content_identifiers, True)
 
     def bulk_deactivate_by_content(self, source_id: int, content_identifiers: List[str]) -> int:
         """Deactivate multiple posts by their content identifiers"""
-        posts = self.db.post_search(
-            source_id=source_id,
-            fields=['id', 'content_identifier']
-        )
-
-        # Filter posts to update
-        to_update = [
-            {'id': post['id'], 'active': False}
-            for post in posts
-            if post['content_identifier'] in content_identifiers
-        ]
-
-        updated = self.db.post_bulk_update(to_update)
-        return len(updated)
+        return self._bulk_set_active_by_content(source_id, content_identifiers, False)
 
     def bulk_deactivate_by_source(self, source_id: int) -> int:
         """Deactivate all posts for a source"""
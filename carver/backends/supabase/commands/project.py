@@ -11,13 +11,16 @@ import click
 
 from tabulate import tabulate
 
-from carver.feeds.youtube import YouTubePlaylistDiscovery
 from carver.utils import *
 
 from .post_manager import PostManager
 from .artifact_manager import ArtifactManager
 from ..utils import *
 
+# Spec columns needed by commands that only label specs. The source and
+# project names come from the minimal join specification_search adds.
+SPEC_SUMMARY_FIELDS = ['id', 'name', 'source_id']
+
 @click.group()
 @click.pass_context
 def project(ctx):
@@ -41,10 +44,10 @@ def add(ctx, name: str, description: Optional[str], owner: str, project_type: st
     db = ctx.obj['supabase']
 
     try:
-        config_json = json.loads(config) if config else {}
-        metadata_json = json.loads(metadata) if metadata else {}
+        config_json = json_loads(config) if config else {}
+        metadata_json = json_loads(metadata) if metadata else {}
 
-        now = datetime.utcnow()
+        now = datetime.utcnow().isoformat()
 
         data = {
             'active': True,
@@ -54,8 +57,8 @@ def add(ctx, name: str, description: Optional[str], owner: str, project_type: st
             'project_type': project_type,
             'config': config_json,
             'metadata': metadata_json,
-            'created_at': now.isoformat(),
-            'updated_at': now.isoformat()
+            'created_at': now,
+            'updated_at': now
         }
 
         project = db.project_create(data)
@@ -107,9 +110,9 @@ def update(ctx, project_id: int, activate: bool, deactivate: bool,
         if project_type:
             update_data['project_type'] = project_type
         if config:
-            update_data['config'] = json.loads(config)
+            update_data['config'] = json_loads(config)
         if metadata:
-            update_data['metadata'] = json.loads(metadata)
+            update_data['metadata'] = json_loads(metadata)
 
         project = db.project_update(project_id, update_data)
 
@@ -133,10 +136,7 @@ def update(ctx, project_id: int, activate: bool, deactivate: bool,
 @click.option('--search', help='Search in project names')
 @click.option('--created-since', help='Show projects created since (ISO date or relative like "1d", "1w")')
 @click.option('--updated-since', help='Show projects updated since (ISO date or relative like "1d", "1w")')
-@click.option('--format', 'output_format',
-              type=click.Choice(['table', 'grid', 'pipe', 'orgtbl', 'rst', 'mediawiki', 'html']),
-              default='table',
-              help='Output format for the table')
+@table_format_option()
 @click.pass_context
 def search(ctx, active: Optional[bool], project_type: Optional[str], owner: Optional[str],
            search: Optional[str], created_since: Optional[str], updated_since: Optional[str],
@@ -162,22 +162,23 @@ def search(ctx, active: Optional[bool], project_type: Optional[str], owner: Opti
         if projects:
             # Prepare table data
             headers = ['ID', 'Name', 'Type', 'Owner', 'Active', 'Created', 'Updated', 'Description']
-            rows = []
-
-            for project in projects:
-                rows.append([
-                    project['id'],
-                    project['name'],
-                    project['project_type'],
-                    project['owner'],
-                    '✓' if project['active'] else '✗',
-                    format_datetime(project['created_at']),
-                    format_datetime(project['updated_at']),
-                    (project.get('description') or '')[:50] + ('...' if project.get('description', '') and len(project['description']) > 50 else '')
-                ])
+
+            def generate_rows():
+                for project in projects:
+                    description = project.get('description') or ''
+                    yield [
+                        project['id'],
+                        project['name'],
+                        project['project_type'],
+                        project['owner'],
+                        '✓' if project['active'] else '✗',
+                        format_datetime(project['created_at']),
+                        format_datetime(project['updated_at']),
+                        description[:50] + ('...' if len(description) > 50 else '')
+                    ]
 
             # Print table
-            click.echo(tabulate(rows, headers=headers, tablefmt=output_format))
+            echo_table(generate_rows(), headers=headers, tablefmt=output_format)
             click.echo(f"\nTotal projects: {len(projects)}")
         else:
             click.echo("No projects found")
@@ -199,31 +200,39 @@ def show(ctx, project_id: int):
             click.echo(f"Project with ID {project_id} not found", err=True)
             return
 
-        # Basic information
-        click.echo("\n=== Project Information ===")
-        click.echo(f"ID: {project['id']}")
-        click.echo(f"Name: {project['name']}")
-        click.echo(f"Type: {project['project_type']}")
-        click.echo(f"Owner: {project['owner']}")
-        click.echo(f"Active: {'Yes' if project['active'] else 'No'}")
+        # Output is collected and written at once
+        lines = []
 
-        if project['description']:
-            click.echo(f"\nDescription: {project['description']}")
+        # Basic information
+        lines.append("\n=== Project Information ===")
+        lines.append(f"ID: {project['id']}")
+        lines.append(f"Name: {project['name']}")
+        lines.append(f"Type: {project['project_type']}")
+        lines.append(f"Owner: {project['owner']}")
+        lines.append(f"Active: {'Yes' if project['active'] else 'No'}")
+
+        description = project.get('description')
+        if description:
+            lines.append(f"\nDescription: {description}")
 
         # Timestamps
-        click.echo("\n=== Timestamps ===")
-        click.echo(f"Created: {format_datetime(project['created_at'])}")
-        click.echo(f"Updated: {format_datetime(project['updated_at'])}")
+        lines.append("\n=== Timestamps ===")
+        lines.append(f"Created: {format_datetime(project['created_at'])}")
+        lines.append(f"Updated: {format_datetime(project['updated_at'])}")
 
         # Configuration
-        if project.get('config'):
-            click.echo("\n=== Configuration ===")
-            click.echo(json.dumps(project['config'], indent=2))
+        config = project.get('config')
+        if config:
+            lines.append("\n=== Configuration ===")
+            lines.append(json_dumps(config))
 
         # Metadata
-        if project.get('metadata'):
-            click.echo("\n=== Metadata ===")
-            click.echo(json.dumps(project['metadata'], indent=2))
+        metadata = project.get('metadata')
+        if metadata:
+            lines.append("\n=== Metadata ===")
+            lines.append(json_dumps(metadata))
+
+        click.echo("\n".join(lines))
 
     except Exception as e:
         traceback.print_exc()
@@ -242,9 +251,10 @@ def validate_choice(value):
               default='playlist',
               type=click.Choice(['playlist', 'channel']))
 @click.option('--max-results', '-m', default=10, help='Maximum number of playlists to discover')
+@click.option('--yes', '-y', is_flag=True, help='Create sources for all playlists without prompting')
 @click.pass_context
 def discover_playlists(ctx, project_id: int, keywords: tuple, what: str,
-                       max_results: int):
+                       max_results: int, yes: bool):
     """Discover YouTube playlists based on keywords and create sources for the project."""
     db = ctx.obj['supabase']
 
@@ -255,6 +265,7 @@ def discover_playlists(ctx, project_id: int, keywords: tuple, what: str,
             click.echo(f"Project with ID {project_id} not found", err=True)
             return
 
+        from carver.feeds.youtube import YouTubePlaylistDiscovery
 
         discovery = YouTubePlaylistDiscovery()
         query = ' '.join(keywords)
@@ -270,7 +281,21 @@ def discover_playlists(ctx, project_id: int, keywords: tuple, what: str,
 
         click.echo(f"Found {len(playlists)} playlists")
 
+        # Playlists already added to the project are skipped
+        existing = {
+            source['source_identifier']
+            for source in db.source_search(project_id=project_id,
+                                           platform='youtube',
+                                           fields=['source_identifier'])
+        }
+
+        # With --yes the sources are created together at the end
+        to_create = []
+
         for playlist in playlists:
+            if playlist['id'] in existing:
+                click.echo(f"\nSkipping {playlist['title']}: already a source of this project")
+                continue
 
             prefix = "https://www.youtube.com"
             if what == 'playlist':
@@ -284,6 +309,29 @@ def discover_playlists(ctx, project_id: int, keywords: tuple, what: str,
             click.echo(f"Description: {playlist['description'][:200]}")
             click.echo(f"Published: {playlist['published_at']}")
 
+            source_data = {
+                'name': playlist['title'],
+                'description': playlist['description'],
+                'platform': 'youtube',
+                'project_id': project_id,
+                'active': True,
+                'url': url,
+                'source_type': 'playlist',
+                'source_identifier': playlist['id'],
+                'config': {
+                },
+                'analysis_metadata': {
+                    'channel': playlist['channel_title'],
+                    'published_at': playlist['published_at'],
+                    'thumbnail_url': playlist['thumbnail_url']
+                }
+            }
+
+            if yes:
+                to_create.append(source_data)
+                existing.add(playlist['id'])
+                continue
+
             choice = click.prompt(
                 "Choose an option (yes, NO, exit)",
                 type=str,
@@ -294,31 +342,18 @@ def discover_playlists(ctx, project_id: int, keywords: tuple, what: str,
                 break
 
             if choice in ["y", "yes"]:
-                source_data = {
-                    'name': playlist['title'],
-                    'description': playlist['description'],
-                    'platform': 'youtube',
-                    'project_id': project_id,
-                    'active': True,
-                    'url': url,
-                    'source_type': 'playlist',
-                    'source_identifier': playlist['id'],
-                    'config': {
-                    },
-                    'analysis_metadata': {
-                        'channel': playlist['channel_title'],
-                        'published_at': playlist['published_at'],
-                        'thumbnail_url': playlist['thumbnail_url']
-                    }
-                }
-
                 # Create the source
                 source = db.source_create(source_data)
                 if source:
+                    existing.add(playlist['id'])
                     click.echo(f"Created source ID: {source['id']} for playlist: {playlist['title']}")
                 else:
                     click.echo("Error creating source", err=True)
 
+        if to_create:
+            created = db.source_bulk_create(to_create)
+            click.echo(f"\nCreated {len(created)} of {len(to_create)} sources")
+
     except Exception as e:
         traceback.print_exc()
         click.echo(f"Error: {str(e)}", err=True)
@@ -338,7 +373,8 @@ def search_similar(ctx, project_id: int, query: str, threshold: float, limit: in
         # Get all specs for the project
         specs = db.specification_search(
             project_id=project_id,
-            active=True
+            active=True,
+            fields=SPEC_SUMMARY_FIELDS
         )
 
         if not specs:
@@ -347,34 +383,27 @@ def search_similar(ctx, project_id: int, query: str, threshold: float, limit: in
 
         specmap = {spec['id']: spec for spec in specs}
 
-        # Search across all specs
-        all_results = []
-        for spec in specs:
-            print(f"[{spec['name']}] Searching")
-            results = artifact_manager.artifact_search_similar(
-                query=query,
-                match_threshold=threshold,
-                match_count=limit,
-                spec_id=spec['id']
-            )
-            all_results.extend(results)
-            print(f"[{spec['name']}] Found {len(results)} Total {len(all_results)}")
-
-        # Sort by similarity and limit
-        all_results.sort(key=lambda x: x['similarity'], reverse=True)
+        # Search across all specs, best matches first
+        all_results = artifact_manager.artifact_search_similar_multi(
+            query=query,
+            spec_ids=list(specmap),
+            match_threshold=threshold,
+            match_count=limit
+        )
 
         if all_results:
             headers = ['ID', 'Source', 'Spec', 'Title', 'Type', 'Similarity']
-            rows = [[
+            rows = ([
                 r['id'],
                 specmap[r['spec_id']]['carver_source']['name'],
                 specmap[r['spec_id']]['name'],
                 r['title'],
                 r['artifact_type'],
                 f"{r['similarity']:.3f}"
-            ] for r in all_results]
+            ] for r in all_results)
 
-            click.echo(tabulate(rows, headers=headers, maxcolwidths=[None, 20, 20, 40,None, None]))
+            echo_table(rows, headers=headers, tablefmt='simple',
+                       maxcolwidths=[None, 20, 20, 40,None, None])
             click.echo(f"\nTotal results: {len(all_results)}")
         else:
             click.echo("No similar artifacts found")
@@ -406,24 +435,24 @@ def update_embeddings(ctx, project_id: int, batch_size: int, status: Optional[st
     artifact_manager = ctx.obj['artifact_manager']
 
     try:
-        # Get the project first
-        project = db.project_get(project_id)
-        if not project:
-            click.echo(f"Project {project_id} not found", err=True)
-            return
-
-        click.echo(f"\nProcessing embeddings for project: {project['name']}")
-
-        # Get all active specifications for the project's sources
+        # Get all active specifications for the project's sources. The
+        # project comes joined with them.
         specs = db.specification_search(
             project_id=project_id,
-            active=True
+            active=True,
+            fields=SPEC_SUMMARY_FIELDS
         )
 
         if not specs:
-            click.echo("No active specifications found for project")
+            if not db.project_get(project_id):
+                click.echo(f"Project {project_id} not found", err=True)
+            else:
+                click.echo("No active specifications found for project")
             return
 
+        project = specs[0]['carver_source']['carver_project']
+        click.echo(f"\nProcessing embeddings for project: {project['name']}")
+
         click.echo(f"Found {len(specs)} active specifications")
 
         total_processed = 0
@@ -432,49 +461,49 @@ def update_embeddings(ctx, project_id: int, batch_size: int, status: Optional[st
 
         time_filter = parse_date_filter(last) if last else None
 
-        # Process each specification
-        for spec in specs:
-            print(f"[{spec['name']}] Source: {spec['carver_source']['name']}")
-            print(f"[{spec['name']}] Started processing")
-            # Get artifacts without embeddings for this spec
-            artifacts = db.artifact_search(
-                    spec_id=spec['id'],
-                    status=status,
-                    active=True,
-                    modified_after=time_filter,
-                    offset=offset,
-                    limit=limit,
-                    has_embedding=False if not force else None
-                )
-            if len(artifacts) == 0:
-                print(f"[{spec['name']}] Found no artifacts to process")
-                continue
+        total_found = 0
 
-            print(f"[{spec['name']}] Updating {len(artifacts)}")
+        # Process each specification
+        with click.progressbar(specs, label='Processing specifications',
+                               item_show_func=lambda s: s['name'] if s else '') as spec_list:
+            for spec in spec_list:
+                # Get artifacts without embeddings for this spec
+                artifacts = db.artifact_search(
+                        spec_id=spec['id'],
+                        status=status,
+                        active=True,
+                        modified_after=time_filter,
+                        offset=offset,
+                        limit=limit,
+                        has_embedding=False if not force else None
+                    )
+                if len(artifacts) == 0:
+                    continue
 
-            if dry_run:
-                print(f"[{spec['name']}] Dry-run. Done")
-                continue
+                total_found += len(artifacts)
+                if dry_run:
+                    continue
 
-            try:
-                # Update embeddings for this batch
-                result = artifact_manager.artifact_bulk_update_embeddings(
-                    artifacts=artifacts,
-                    force_update=force,
-                    batch_size=batch_size
-                )
+                try:
+                    # Update embeddings for this batch
+                    result = artifact_manager.artifact_bulk_update_embeddings(
+                        artifacts=artifacts,
+                        force_update=force,
+                        batch_size=batch_size
+                    )
 
-                total_processed += result['processed']
-                total_updated += result['updated']
-                total_errors += result['errors']
+                    total_processed += result['processed']
+                    total_updated += result['updated']
+                    total_errors += result['errors']
 
-            except Exception as e:
-                click.echo(f"Error processing batch: {str(e)}", err=True)
-                total_errors += len(batch)
+                except Exception as e:
+                    click.echo(f"\n[{spec['name']}] Error processing batch: {str(e)}", err=True)
+                    total_errors += len(artifacts)
 
         # Print summary
         click.echo("\nEmbedding Update Summary")
         click.echo("=====================")
+        click.echo(f"Artifacts needing embeddings: {total_found}")
         click.echo(f"Total artifacts processed: {total_processed}")
         click.echo(f"Successfully updated: {total_updated}")
         click.echo(f"Errors: {total_errors}")
@@ -490,8 +519,10 @@ def update_embeddings(ctx, project_id: int, batch_size: int, status: Optional[st
 @click.argument('project_id', type=int, required=False)
 @click.option('--fields', help='Comma-separated list of fields to sync for each source')
 @click.option('--max-results', type=int, help='Maximum number of posts to fetch per source')
+@click.option('--workers', type=int, default=8, help='Number of feeds to read in parallel')
 @click.pass_context
-def sync_posts(ctx, project_id: Optional[int], fields: Optional[str], max_results: Optional[int]):
+def sync_posts(ctx, project_id: Optional[int], fields: Optional[str], max_results: Optional[int],
+               workers: int):
     """Sync posts from all active sources for a project or all projects."""
     db = ctx.obj['supabase']
     post_manager = ctx.obj['post_manager']
@@ -514,6 +545,7 @@ def sync_posts(ctx, project_id: Optional[int], fields: Optional[str], max_result
         total_sources = 0
         total_added = 0
         total_updated = 0
+        failed_sources = []
         field_list = fields.split(',') if fields else None
 
         # Process each project
@@ -533,22 +565,25 @@ def sync_posts(ctx, project_id: Optional[int], fields: Optional[str], max_result
             project_added = 0
             project_updated = 0
 
-            # Process each source
+            # Feeds are read in parallel, results are written as they arrive
+            results = post_manager.sync_posts_many(
+                [source['id'] for source in sources],
+                field_list,
+                max_results,
+                max_workers=workers
+            )
+
             for source in sources:
-                click.echo(f"\nProcessing source: {source['name']} (ID: {source['id']})")
-                try:
-                    added, updated = post_manager.sync_posts(
-                        source['id'],
-                        field_list,
-                        max_results
-                    )
-                    project_added += added
-                    project_updated += updated
-                    click.echo(f"- Added: {added}, Updated: {updated}")
-                except Exception as e:
-                    traceback.print_exc()
-                    click.echo(f"Error processing source {source['id']}: {str(e)}", err=True)
+                click.echo(f"\nProcessed source: {source['name']} (ID: {source['id']})")
+                result = results.get(source['id'])
+                if isinstance(result, Exception):
+                    click.echo(f"Error processing source {source['id']}: {str(result)}", err=True)
+                    failed_sources.append(source['id'])
                     continue
+                added, updated = result
+                project_added += added
+                project_updated += updated
+                click.echo(f"- Added: {added}, Updated: {updated}")
 
             total_projects += 1
             total_sources += len(sources)
@@ -558,6 +593,8 @@ def sync_posts(ctx, project_id: Optional[int], fields: Optional[str], max_result
 
         click.echo(f"\nSync completed for {total_projects} projects and {total_sources} sources")
         click.echo(f"Total posts: {total_added} added, {total_updated} updated")
+        if failed_sources:
+            click.echo(f"Failed sources: {failed_sources}", err=True)
 
     except Exception as e:
         traceback.print_exc()
@@ -569,10 +606,11 @@ def sync_posts(ctx, project_id: Optional[int], fields: Optional[str], max_result
               help='Maximum number of retries for dependency resolution')
 @click.option('--last', type=str, help='Filter posts by time (e.g. "1d", "2h", "30m")')
 @click.option('--offset', default=0, type=int, help='Offset for search results')
+@click.option('--since-id', type=int, help='Only posts with an ID greater than this')
 @click.option('--limit', default=50, type=int, help='Maximum number of posts to fetch')
 @click.pass_context
 def generate_bulk(ctx, project_id: Optional[int], max_retries: int, last: Optional[str],
-                 offset: int, limit: int):
+                 offset: int, since_id: Optional[int], limit: int):
     """Generate bulk content for all active specifications of a project or all projects in dependency order."""
     db = ctx.obj['supabase']
     artifact_manager = ctx.obj['artifact_manager']
@@ -594,6 +632,7 @@ def generate_bulk(ctx, project_id: Optional[int], max_retries: int, last: Option
         total_projects = 0
         total_generated = 0
         all_failed_specs = []
+        time_filter = parse_date_filter(last) if last else None
 
         # Process each project
         for project in projects:
@@ -618,29 +657,31 @@ def generate_bulk(ctx, project_id: Optional[int], max_retries: int, last: Option
                 click.echo(f"Error in dependency resolution: {str(e)}", err=True)
                 continue
 
-            # Group specifications by source
-            source_specs = defaultdict(dict)
-            for spec in specs:
-                source_specs[spec['source_id']][spec['id']] = spec
+            # Group specifications by source, keeping the dependency order
+            spec_map = {spec['id']: spec for spec in specs}
+            source_specs = defaultdict(list)
+            for spec_id in sorted_specs_ids:
+                spec = spec_map.get(spec_id)
+                if spec is not None:
+                    source_specs[spec['source_id']].append(spec)
 
             click.echo(f"Found {len(source_specs)} sources")
             project_generated = 0
             failed_specs = []
 
             # Process each source
-            for source_id, source_specs_dict in source_specs.items():
-                sample_spec = next(iter(source_specs_dict.values()))
-                source = sample_spec['carver_source']
+            for source_id, specs_for_source in source_specs.items():
+                source = specs_for_source[0]['carver_source']
                 label = f"[{source_id}] {source['name']}"
                 click.echo(f"\n{label}: Started processing")
 
                 # Get posts needing artifacts
-                time_filter = parse_date_filter(last) if last else None
                 posts = db.post_search_with_artifacts(
                     source_id=source_id,
                     modified_after=time_filter,
                     offset=offset,
-                    limit=limit
+                    limit=limit,
+                    after_id=since_id
                 )
 
                 if not posts:
@@ -650,12 +691,8 @@ def generate_bulk(ctx, project_id: Optional[int], max_retries: int, last: Option
                 click.echo(f"{label}: Found {len(posts)} posts with artifacts")
 
                 # Process specifications for this source
-                for spec_id in sorted_specs_ids:
-                    if spec_id not in source_specs_dict:
-                        continue
-
-                    spec = source_specs_dict[spec_id]
-                    source = spec['carver_source']
+                for spec in specs_for_source:
+                    spec_id = spec['id']
                     click.echo(f"\n{label}: Processing Specification [{spec_id}] {spec['name']}")
 
                     retry_count = 0
@@ -704,11 +741,22 @@ def update_analytics(ctx, project_id: Optional[int]):
 
     try:
         # Get projects to process
+        project_sources = {}
         if project_id:
-            projects = [db.project_get(project_id)]
-            if not projects[0]:
-                click.echo(f"Project with ID {project_id} not found", err=True)
-                return
+            # The project comes joined with its sources
+            sources = db.source_search(
+                project_id=project_id,
+                active=True,
+                fields=['id', 'name']
+            )
+            if sources:
+                projects = [sources[0]['carver_project']]
+            else:
+                projects = [db.project_get(project_id)]
+                if not projects[0]:
+                    click.echo(f"Project with ID {project_id} not found", err=True)
+                    return
+            project_sources[project_id] = sources
         else:
             projects = db.project_search(active=True)
             if not projects:
@@ -721,17 +769,21 @@ def update_analytics(ctx, project_id: Optional[int]):
         total_posts = 0
         total_artifacts = 0
         total_specifications = 0
+        now = datetime.utcnow().isoformat()
 
         # Process each project
         for project in projects:
             click.echo(f"\nUpdating analytics for project: {project['name']} (ID: {project['id']})")
 
             # Get all sources for this project
-            sources = db.source_search(
-                project_id=project['id'],
-                active=True,
-                fields=['id', 'name']
-            )
+            if project['id'] in project_sources:
+                sources = project_sources[project['id']]
+            else:
+                sources = db.source_search(
+                    project_id=project['id'],
+                    active=True,
+                    fields=['id', 'name']
+                )
 
             if not sources:
                 click.echo("No sources found for this project")
@@ -739,37 +791,39 @@ def update_analytics(ctx, project_id: Optional[int]):
 
             click.echo(f"Found {len(sources)} sources to process")
 
+            # Update analytics for all sources, one step per source
+            source_names = {source['id']: source['name'] for source in sources}
+            with click.progressbar(length=len(source_names),
+                                   label='Processing sources') as bar:
+                updated_sources = db.source_update_analytics_bulk(
+                    list(source_names),
+                    progress=lambda source_id: bar.update(1)
+                )
+
+            # Summarized metrics for each source
+            source_counts = {
+                updated_source['id']: updated_source['analysis_metadata']['metrics']['counts']
+                for updated_source in updated_sources
+                if updated_source.get('analysis_metadata')
+            }
+
             project_metrics = {
-                'last_update': datetime.utcnow().isoformat(),
+                'last_update': now,
                 'sources_count': len(sources),
-                'sources': {},
+                'sources': {
+                    source_id: {
+                        'name': source_names[source_id],
+                        'counts': counts
+                    }
+                    for source_id, counts in source_counts.items()
+                },
+                # Totals for project-level metrics
                 'totals': {
-                    'posts': 0,
-                    'artifacts': 0,
-                    'specifications': 0
+                    key: sum(counts[key] for counts in source_counts.values())
+                    for key in ('posts', 'artifacts', 'specifications')
                 }
             }
 
-            # Process each source
-            with click.progressbar(sources, label='Processing sources') as source_list:
-                for source in source_list:
-                    # Update analytics for this source
-                    updated_source = db.source_update_analytics(source['id'])
-
-                    if updated_source and updated_source.get('analysis_metadata'):
-                        metrics = updated_source['analysis_metadata']['metrics']
-
-                        # Accumulate totals for project-level metrics
-                        project_metrics['totals']['posts'] += metrics['counts']['posts']
-                        project_metrics['totals']['artifacts'] += metrics['counts']['artifacts']
-                        project_metrics['totals']['specifications'] += metrics['counts']['specifications']
-
-                        # Store summarized metrics for this source
-                        project_metrics['sources'][source['id']] = {
-                            'name': source['name'],
-                            'counts': metrics['counts']
-                        }
-
             # Update project metadata
             project_analytics = {
                 'metrics': project_metrics,
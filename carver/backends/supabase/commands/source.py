@@ -1,13 +1,14 @@
 import os
 import sys
 import json
+import time
 import traceback
 
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import click
-from tabulate import tabulate
 
 from .post_manager import PostManager
 from .artifact_manager import ArtifactManager
@@ -16,16 +17,24 @@ from .source_manager import SourceManager
 from ..utils import *
 from carver.utils import *
 
-PLATFORM_CHOICES = ['TWITTER', 'GITHUB', 'YOUTUBE', 'RSS', 'WEB', 'SUBSTACK', "EXA"]
-SOURCE_TYPE_CHOICES = ['FEED', 'PROFILE', 'CHANNEL', 'REPOSITORY', 'PAGE', "NEWSLETTER", "SEARCH"]
+PLATFORM_CHOICES = ('TWITTER', 'GITHUB', 'YOUTUBE', 'RSS', 'WEB', 'SUBSTACK', "EXA")
+SOURCE_TYPE_CHOICES = ('FEED', 'PROFILE', 'CHANNEL', 'REPOSITORY', 'PAGE', "NEWSLETTER", "SEARCH")
+
+# Columns rendered by the search command
+SEARCH_FIELDS = ['id', 'name', 'project_id', 'platform', 'source_type',
+                 'active', 'last_crawled', 'updated_at']
 
 @click.group()
+@click.option('--no-cache', is_flag=True,
+              help='Do not reuse source lookups cached by earlier commands')
 @click.pass_context
-def source(ctx):
+def source(ctx, no_cache: bool):
     """Manage sources in the system."""
-    ctx.obj['post_manager'] = PostManager(ctx.obj['supabase'])
-    ctx.obj['artifact_manager'] = ArtifactManager(ctx.obj['supabase'])
-    ctx.obj['source_manager'] = SourceManager(ctx.obj['supabase'])
+    # All managers share the one client and its HTTP session
+    db = ctx.obj['supabase']
+    ctx.obj['post_manager'] = PostManager(db, use_disk_cache=not no_cache)
+    ctx.obj['artifact_manager'] = ArtifactManager(db)
+    ctx.obj['source_manager'] = SourceManager(db)
 
 @source.command()
 @click.option('--url', required=True, help='URL of the source')
@@ -56,17 +65,17 @@ def add(ctx, url: str, project_id: int, name: Optional[str],
 
         # Merge additional config if provided
         if config:
-            config_json = json.loads(config)
+            config_json = json_loads(config)
             source_info['config'] = {**source_info['config'], **config_json}
 
         # Add required fields
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc).isoformat()
         source_info.update({
             'active': True,
             'project_id': project_id,
             'analysis_metadata': {},
-            'created_at': now.isoformat(),
-            'updated_at': now.isoformat()
+            'created_at': now,
+            'updated_at': now
         })
 
         # Create the source
@@ -115,13 +124,13 @@ def add_with_template(ctx, project_id: int, template_name: str,
             source['description'] = description
 
         # Add required fields
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc).isoformat()
         source.update({
             'active': True,
             'project_id': project_id,
             'analysis_metadata': {},
-            'created_at': now.isoformat(),
-            'updated_at': now.isoformat()
+            'created_at': now,
+            'updated_at': now
         })
 
         # Create the source
@@ -146,8 +155,8 @@ def add_with_template(ctx, project_id: int, template_name: str,
 @click.option('--deactivate', is_flag=True, help='Deactivate the source')
 @click.option('--name', help='New name for the source')
 @click.option('--description', help='New description for the source')
-@click.option('--platform', type=click.Choice(PLATFORM_CHOICES))
-@click.option('--source-type', type=click.Choice(SOURCE_TYPE_CHOICES))
+@click.option('--platform', type=click.Choice(PLATFORM_CHOICES, case_sensitive=False))
+@click.option('--source-type', type=click.Choice(SOURCE_TYPE_CHOICES, case_sensitive=False))
 @click.option('--source-identifier', help='New source identifier')
 @click.option('--project-id', required=True, type=int, help='ID of the parent project')
 @click.option('--url', help='New URL')
@@ -164,7 +173,8 @@ def update(ctx, source_id: int, activate: bool, deactivate: bool,
     db = ctx.obj['supabase']
 
     try:
-        update_data = {'updated_at': datetime.utcnow().isoformat()}
+        now = datetime.now(timezone.utc).isoformat()
+        update_data = {'updated_at': now}
 
         if activate and deactivate:
             click.echo("Error: Cannot both activate and deactivate", err=True)
@@ -179,27 +189,44 @@ def update(ctx, source_id: int, activate: bool, deactivate: bool,
         if description:
             update_data['description'] = description
         if platform:
-            update_data['platform'] = platform.strip().upper()
+            update_data['platform'] = platform
         if project_id:
             update_data['project_id'] = project_id
         if source_type:
-            update_data['source_type'] = source_type.strip().upper()
+            update_data['source_type'] = source_type
         if source_identifier:
             update_data['source_identifier'] = source_identifier
         if url:
             update_data['url'] = url
         if config:
-            try:
-                update_data['config'] = json.load(open(config))
-            except:
-                update_data['config'] = json.loads(config)
+            # Either a path to a JSON file or inline JSON
+            if os.path.isfile(config):
+                with open(config, 'rb') as fd:
+                    update_data['config'] = json_loads(fd.read())
+            else:
+                update_data['config'] = json_loads(config)
+
+        # updated_at and the required --project-id alone are not an update
+        has_updates = any(key not in ('updated_at', 'project_id') for key in update_data)
+        if not has_updates and not metadata:
+            click.echo("Nothing to update")
+            return
+
+        # Metadata is merged into the same write so the row is updated once
+        if metadata:
+            metadata_json = json_loads(metadata)
+            current = db.source_get(source_id)
+            if not current:
+                click.echo("Error updating source or source not found", err=True)
+                return
+            update_data['analysis_metadata'] = {
+                **(current.get('analysis_metadata') or {}),
+                **metadata_json
+            }
 
         source = db.source_update(source_id, update_data)
 
-        # Handle metadata update separately if provided
-        if metadata:
-            metadata_json = json.loads(metadata)
-            source = db.source_update_metadata(source_id, metadata_json)
+        ctx.obj['post_manager'].invalidate_source(source_id)
 
         if source:
             click.echo(f"Successfully updated source ID: {source_id}")
@@ -215,20 +242,20 @@ def update(ctx, source_id: int, activate: bool, deactivate: bool,
 @source.command()
 @click.option('--active/--inactive', default=None, help='Filter by active status')
 @click.option('--project-id', type=int, help='Filter by project ID')
-@click.option('--platform', type=click.Choice(PLATFORM_CHOICES))
-@click.option('--source-type', type=click.Choice(SOURCE_TYPE_CHOICES))
+@click.option('--platform', type=click.Choice(PLATFORM_CHOICES, case_sensitive=False))
+@click.option('--source-type', type=click.Choice(SOURCE_TYPE_CHOICES, case_sensitive=False))
 @click.option('--search', help='Search in source names')
 @click.option('--updated-since', help='Show sources updated since (ISO date or relative like "1d", "1w")')
 @click.option('--crawled-since', help='Show sources crawled since (ISO date or relative like "1d", "1w")')
-@click.option('--format', 'output_format',
-              type=click.Choice(['table', 'grid', 'pipe', 'orgtbl', 'rst', 'mediawiki', 'html']),
-              default='table',
-              help='Output format for the table')
+@click.option('--limit', type=int, default=100, help='Number of sources to return')
+@click.option('--after-id', type=int, help='Only show sources with an ID greater than this')
+@table_format_option()
 @click.pass_context
 def search(ctx, active: Optional[bool], project_id: Optional[int],
            platform: Optional[str], source_type: Optional[str],
            search: Optional[str], updated_since: Optional[str],
-           crawled_since: Optional[str], output_format: str):
+           crawled_since: Optional[str], limit: int, after_id: Optional[int],
+           output_format: str):
     """List sources with optional filters."""
     db = ctx.obj['supabase']
 
@@ -237,38 +264,67 @@ def search(ctx, active: Optional[bool], project_id: Optional[int],
         updated_since_dt = parse_date_filter(updated_since) if updated_since else None
         crawled_since_dt = parse_date_filter(crawled_since) if crawled_since else None
 
-        # Query sources
-        sources = db.source_search(
-            active=active,
-            project_id=project_id,
-            platform=platform,
-            source_type=source_type,
-            name=search,
-            updated_since=updated_since_dt,
-            crawled_since=crawled_since_dt
-        )
+        headers = ['ID', 'Name', 'Project', 'Platform', 'Type', 'Active', 'Last Crawled', 'Updated']
 
-        if sources:
-            # Prepare table data
-            headers = ['ID', 'Name', 'Project', 'Platform', 'Type', 'Active', 'Last Crawled', 'Updated']
-            rows = []
+        # Sources of a project share the same label
+        project_labels = {}
 
+        def generate_rows(sources):
+            fmt = format_datetime
             for source in sources:
-                project_name = source['carver_project']['name'] if source['carver_project'] else 'N/A'
-                rows.append([
+                project_id = source['project_id']
+                project_label = project_labels.get(project_id)
+                if project_label is None:
+                    carver_project = source.get('carver_project')
+                    project_name = carver_project['name'] if carver_project else 'N/A'
+                    project_label = project_labels[project_id] = f"{project_name} ({project_id})"
+                name = source['name']
+                last_crawled = source.get('last_crawled')
+                yield [
                     source['id'],
-                    source['name'][:30] + ('...' if len(source['name']) > 30 else ''),
-                    f"{project_name} ({source['project_id']})",
+                    name[:30] + ('...' if len(name) > 30 else ''),
+                    project_label,
                     source['platform'],
                     source['source_type'],
                     '✓' if source['active'] else '✗',
-                    format_datetime(source['last_crawled']) if source.get('last_crawled') else 'Never',
-                    format_datetime(source['updated_at'])
-                ])
-
-            # Print table
-            click.echo(tabulate(rows, headers=headers, tablefmt=output_format))
-            click.echo(f"\nTotal sources: {len(sources)}")
+                    fmt(last_crawled) if last_crawled else 'Never',
+                    fmt(source['updated_at'])
+                ]
+
+        # Fetch and print a page at a time. Interactive sessions are
+        # asked before the next page is fetched.
+        total = 0
+        while True:
+            sources = db.source_search(
+                active=active,
+                project_id=project_id,
+                platform=platform,
+                source_type=source_type,
+                name=search,
+                updated_since=updated_since_dt,
+                crawled_since=crawled_since_dt,
+                fields=SEARCH_FIELDS,
+                limit=limit,
+                after_id=after_id
+            )
+            if not sources:
+                break
+
+            echo_table(generate_rows(sources), headers=headers, tablefmt=output_format)
+            total += len(sources)
+
+            if len(sources) < limit:
+                break
+
+            after_id = sources[-1]['id']
+            # Only prompt when a user can see the prompt and answer it
+            interactive = sys.stdin.isatty() and sys.stdout.isatty()
+            if not (interactive and click.confirm("More?", default=True)):
+                click.echo(f"Note: More sources may be available. Use --after-id {after_id} to see more.")
+                break
+
+        if total:
+            click.echo(f"\nTotal sources: {total}")
         else:
             click.echo("No sources found")
 
@@ -281,52 +337,57 @@ def search(ctx, active: Optional[bool], project_id: Optional[int],
 @click.pass_context
 def show(ctx, source_id: int):
     """Show detailed information about a specific source."""
-    db = ctx.obj['supabase']
+    post_manager = ctx.obj['post_manager']
 
     try:
-        source = db.source_get(source_id)
+        source = post_manager.get_source(source_id)
         if not source:
             click.echo(f"Source with ID {source_id} not found", err=True)
             return
 
         project = source['carver_project']
 
+        # Output is collected and written at once
+        lines = []
+
         # Basic information
-        click.echo("\n=== Source Information ===")
-        click.echo(f"ID: {source['id']}")
-        click.echo(f"Name: {source['name']}")
-        click.echo(f"Active: {'Yes' if source['active'] else 'No'}")
-        click.echo(f"Platform: {source['platform']}")
-        click.echo(f"Type: {source['source_type']}")
-        click.echo(f"Identifier: {source['source_identifier']}")
-        click.echo(f"URL: {source['url']}")
+        lines.append("\n=== Source Information ===")
+        lines.append(f"ID: {source['id']}")
+        lines.append(f"Name: {source['name']}")
+        lines.append(f"Active: {'Yes' if source['active'] else 'No'}")
+        lines.append(f"Platform: {source['platform']}")
+        lines.append(f"Type: {source['source_type']}")
+        lines.append(f"Identifier: {source['source_identifier']}")
+        lines.append(f"URL: {source['url']}")
 
         if source['description']:
-            click.echo(f"\nDescription: {source['description']}")
+            lines.append(f"\nDescription: {source['description']}")
 
         # Project information
-        click.echo("\n=== Parent Project ===")
-        click.echo(f"ID: {project['id']}")
-        click.echo(f"Name: {project['name']}")
-        click.echo(f"Type: {project['project_type']}")
-        click.echo(f"Owner: {project['owner']}")
+        lines.append("\n=== Parent Project ===")
+        lines.append(f"ID: {project['id']}")
+        lines.append(f"Name: {project['name']}")
+        lines.append(f"Type: {project['project_type']}")
+        lines.append(f"Owner: {project['owner']}")
 
         # Timestamps
-        click.echo("\n=== Timestamps ===")
-        click.echo(f"Created: {format_datetime(source['created_at'])}")
-        click.echo(f"Updated: {format_datetime(source['updated_at'])}")
+        lines.append("\n=== Timestamps ===")
+        lines.append(f"Created: {format_datetime(source['created_at'])}")
+        lines.append(f"Updated: {format_datetime(source['updated_at'])}")
         if source.get('last_crawled'):
-            click.echo(f"Last Crawled: {format_datetime(source['last_crawled'])}")
+            lines.append(f"Last Crawled: {format_datetime(source['last_crawled'])}")
 
         # Configuration
         if source.get('config'):
-            click.echo("\n=== Configuration ===")
-            click.echo(json.dumps(source['config'], indent=2))
+            lines.append("\n=== Configuration ===")
+            lines.append(json_dumps(source['config']))
 
         # Analysis Metadata
         if source.get('analysis_metadata'):
-            click.echo("\n=== Analysis Metadata ===")
-            click.echo(json.dumps(source['analysis_metadata'], indent=2))
+            lines.append("\n=== Analysis Metadata ===")
+            lines.append(json_dumps(source['analysis_metadata']))
+
+        click.echo("\n".join(lines))
 
     except Exception as e:
         traceback.print_exc()
@@ -336,15 +397,19 @@ def show(ctx, source_id: int):
 @click.argument('source_id', type=int)
 @click.option('--fields', help='Comma-separated list of fields to sync')
 @click.option('--max-results', type=int, help='Maximum number of posts to fetch')
+@click.option('--batch-size', default=1000, type=int,
+              help='Number of posts written per bulk request')
 @click.pass_context
-def sync_posts(ctx, source_id: int, fields: Optional[str], max_results: Optional[int]):
+def sync_posts(ctx, source_id: int, fields: Optional[str], max_results: Optional[int],
+               batch_size: int):
     """Sync posts from a specific source."""
     db = ctx.obj['supabase']
     post_manager = ctx.obj['post_manager']
 
     try:
-        # Verify source exists and is active
-        source = db.source_get(source_id)
+        # Verify source exists and is active. The lookup is cached so
+        # sync_posts does not fetch the source again.
+        source = post_manager.get_source(source_id)
         if not source:
             click.echo(f"Source {source_id} not found", err=True)
             return
@@ -358,7 +423,8 @@ def sync_posts(ctx, source_id: int, fields: Optional[str], max_results: Optional
 
         field_list = fields.split(',') if fields else None
         try:
-            added, updated = post_manager.sync_posts(source_id, field_list, max_results)
+            added, updated = post_manager.sync_posts(source_id, field_list, max_results,
+                                                     batch_size=batch_size)
             click.echo(f"Successfully synced posts:")
             click.echo(f"- Added: {added}")
             click.echo(f"- Updated: {updated}")
@@ -376,9 +442,10 @@ def sync_posts(ctx, source_id: int, fields: Optional[str], max_results: Optional
 def update_analytics(ctx, source_id: int):
     """Update analytics metadata for a source."""
     db = ctx.obj['supabase']
+    post_manager = ctx.obj['post_manager']
 
     try:
-        # Verify source exists
+        # The row is used to merge the metadata, so read it fresh
         source = db.source_get(source_id)
         if not source:
             click.echo(f"Source {source_id} not found", err=True)
@@ -387,22 +454,27 @@ def update_analytics(ctx, source_id: int):
         click.echo(f"\nComputing analytics for source: {source['name']} (ID: {source_id})")
 
         # Update analytics using the new method
-        updated_source = db.source_update_analytics(source_id)
+        updated_source = db.source_update_analytics(source_id, source=source)
+        post_manager.invalidate_source(source_id)
 
         if updated_source and updated_source.get('analysis_metadata'):
             metrics = updated_source['analysis_metadata']['metrics']
-            click.echo("\nAnalytics updated successfully:")
-            click.echo(f"- Active Posts: {metrics['counts']['posts']}")
-            click.echo(f"- Active Artifacts: {metrics['counts']['artifacts']}")
-            click.echo(f"- Active Specifications: {metrics['counts']['specifications']}")
-
-            click.echo("\nArtifact Type Distribution:")
-            for artifact_type, count in metrics['distribution']['artifact_type'].items():
-                click.echo(f"- {artifact_type}: {count}")
-
-            click.echo("\nArtifact Status Distribution:")
-            for status, count in metrics['distribution']['artifact_status'].items():
-                click.echo(f"- {status}: {count}")
+            lines = []
+            lines.append("\nAnalytics updated successfully:")
+            lines.append(f"- Active Posts: {metrics['counts']['posts']}")
+            lines.append(f"- Active Artifacts: {metrics['counts']['artifacts']}")
+            lines.append(f"- Active Specifications: {metrics['counts']['specifications']}")
+
+            distribution = metrics['distribution']
+            lines.append("\nArtifact Type Distribution:")
+            lines.extend(f"- {artifact_type}: {count}"
+                         for artifact_type, count in distribution['artifact_type'].items())
+
+            lines.append("\nArtifact Status Distribution:")
+            lines.extend(f"- {status}: {count}"
+                         for status, count in distribution['artifact_status'].items())
+
+            click.echo("\n".join(lines))
         else:
             click.echo("Error updating source analytics", err=True)
 
@@ -418,42 +490,45 @@ def update_analytics(ctx, source_id: int):
 @click.option('--offset', default=0, type=int, help='Offset for search results')
 @click.option('--limit', default=50, type=int, help='Maximum number of posts to fetch')
 @click.option('--generator-name', type=str, help='Optional generator name to filter specifications')
+@click.option('--workers', type=int, default=4,
+              help='Number of independent specifications to process in parallel')
+@click.option('--batch-size', default=50, type=int,
+              help='Number of posts to fetch and process at a time')
 @click.pass_context
 def generate_bulk(ctx, source_id: int, max_retries: int, last: Optional[str],
-                 offset: int, limit: int, generator_name: Optional[str]):
+                 offset: int, limit: int, generator_name: Optional[str], workers: int,
+                 batch_size: int):
     """Generate bulk content for all active specifications of a source in dependency order."""
     db = ctx.obj['supabase']
     artifact_manager = ctx.obj['artifact_manager']
 
     try:
         # Get source details
-        source = db.source_get(source_id)
+        source = ctx.obj['post_manager'].get_source(source_id)
         if not source:
             click.echo(f"Source {source_id} not found")
             return
 
-        # Get all active specifications for the source
+        # Get the active specifications for the source, only those of
+        # the generator if one is given
         specs = db.specification_search(
             source_id=source_id,
-            active=True
+            active=True,
+            generator=generator_name
         )
 
         if not specs:
-            click.echo("No active specifications found for source")
-            return
-
-        # Filter specs by generator if specified
-        if generator_name:
-            specs = [s for s in specs if s['config'].get('generator') == generator_name]
-            if not specs:
+            if generator_name:
                 click.echo(f"No active specifications found for generator {generator_name}")
-                return
+            else:
+                click.echo("No active specifications found for source")
+            return
 
         click.echo(f"Found {len(specs)} active specifications")
 
-        # Sort specifications by dependencies
+        # Group specifications into dependency levels
         try:
-            sorted_specs_ids = topological_sort(specs)
+            spec_levels = topological_levels(specs)
         except ValueError as e:
             click.echo(f"Error in dependency resolution: {str(e)}", err=True)
             return
@@ -461,20 +536,7 @@ def generate_bulk(ctx, source_id: int, max_retries: int, last: Optional[str],
         # Create a map of spec ID to spec data
         spec_map = {spec['id']: spec for spec in specs}
 
-        # Get posts needing artifacts
         time_filter = parse_date_filter(last) if last else None
-        posts = db.post_search_with_artifacts(
-            source_id=source_id,
-            modified_after=time_filter,
-            offset=offset,
-            limit=limit
-        )
-
-        if not posts:
-            click.echo("No posts found requiring artifact generation")
-            return
-
-        click.echo(f"Found {len(posts)} posts to process")
 
         # Process specifications in dependency order
         total_generated = 0
@@ -482,33 +544,87 @@ def generate_bulk(ctx, source_id: int, max_retries: int, last: Optional[str],
 
         label = f"[{source['name']}]"
 
-        for spec_id in sorted_specs_ids:
-            if spec_id not in spec_map:
-                continue
-
-            spec = spec_map[spec_id]
-            click.echo(f"\n{label} Processing Specification [{spec_id}] {spec['name']}")
-
+        def process_spec(spec, posts):
+            """Generate the artifacts of one spec, backing off between retries"""
             retry_count = 0
-            success = False
-
-            while retry_count < max_retries and not success:
+            while True:
                 try:
-                    results = artifact_manager.artifact_bulk_create_from_spec(
+                    return artifact_manager.artifact_bulk_create_from_spec(
                         spec,
                         posts,
                         None  # Use default generator from spec
                     )
-                    total_generated += len(results)
-                    click.echo(f"Generated {len(results)} artifacts")
-                    success = True
-                except Exception as e:
+                except Exception:
                     retry_count += 1
-                    if retry_count < max_retries:
-                        click.echo(f"Retry {retry_count}/{max_retries} for spec {spec['id']}")
-                    else:
-                        click.echo(f"Failed to process spec {spec['id']} after {max_retries} attempts: {str(e)}", err=True)
-                        failed_specs.append(spec['id'])
+                    if retry_count >= max_retries:
+                        raise
+                    click.echo(f"Retry {retry_count}/{max_retries} for spec {spec['id']}")
+                    time.sleep(2 ** retry_count)
+
+        # Posts are fetched and processed batch_size at a time so only
+        # one batch is held in memory. Later batches continue after the
+        # last post id seen.
+        fetched = 0
+        after_id = None
+        while fetched < limit:
+            batch_limit = min(batch_size, limit - fetched)
+            posts = db.post_search_with_artifacts(
+                source_id=source_id,
+                modified_after=time_filter,
+                offset=offset if after_id is None else 0,
+                limit=batch_limit,
+                after_id=after_id
+            )
+            if not posts:
+                break
+
+            fetched += len(posts)
+            after_id = posts[-1]['id']
+            post_map = {post['id']: post for post in posts}
+            click.echo(f"\n{label} Processing {len(posts)} posts ({fetched} so far)")
+
+            # Specs of a level only depend on earlier levels. They are run
+            # in parallel and the level completes before the next starts.
+            for level in spec_levels:
+                level_specs = [spec_map[spec_id] for spec_id in level if spec_id in spec_map]
+                if not level_specs:
+                    continue
+
+                for spec in level_specs:
+                    click.echo(f"\n{label} Processing Specification [{spec['id']}] {spec['name']}")
+
+                # artifact_bulk_create_from_spec appends new artifacts to the
+                # posts it is given. Each spec gets its own artifact lists,
+                # copied before any spec of the level runs, so specs running
+                # in parallel do not see each other's output.
+                with ThreadPoolExecutor(max_workers=max(1, min(workers, len(level_specs)))) as executor:
+                    futures = {}
+                    for spec in level_specs:
+                        spec_posts = [{**post, 'artifacts': list(post.get('artifacts') or [])}
+                                      for post in posts]
+                        futures[executor.submit(process_spec, spec, spec_posts)] = spec
+                    for future in as_completed(futures):
+                        spec = futures[future]
+                        try:
+                            results = future.result()
+                            # Make the new artifacts visible to the next level
+                            for artifact in results:
+                                post = post_map.get(artifact.get('post_id'))
+                                if post is not None:
+                                    post.setdefault('artifacts', []).append(artifact)
+                            total_generated += len(results)
+                            click.echo(f"{label} Generated {len(results)} artifacts for spec {spec['id']}")
+                        except Exception as e:
+                            click.echo(f"Failed to process spec {spec['id']} after {max_retries} attempts: {str(e)}", err=True)
+                            if spec['id'] not in failed_specs:
+                                failed_specs.append(spec['id'])
+
+            if len(posts) < batch_limit:
+                break
+
+        if not fetched:
+            click.echo("No posts found requiring artifact generation")
+            return
 
         click.echo(f"\nBulk generation completed")
         click.echo(f"Total artifacts generated: {total_generated}")
@@ -535,7 +651,7 @@ def generate_knowledge_graph(ctx, source_id: int, batch_size: int,
 
     try:
         # Get source details
-        source = source_manager.db.source_get(source_id)
+        source = ctx.obj['post_manager'].get_source(source_id)
         if not source:
             click.echo(f"Source {source_id} not found")
             return
@@ -570,34 +686,35 @@ def generate_knowledge_graph(ctx, source_id: int, batch_size: int,
         click.echo(f"Error: {str(e)}", err=True)
 
 
-@source.command()
-@click.argument('source_ids', nargs=-1, type=int, required=True)
-@click.pass_context
-def activate(ctx, source_ids):
-    """Activate one or more sources by their IDs."""
-    source_manager = ctx.obj['source_manager']
-
+def _set_sources_active(ctx, source_ids, active: bool):
+    """Shared implementation of activate and deactivate"""
     db = ctx.obj['supabase']
+    post_manager = ctx.obj['post_manager']
+    action = 'activated' if active else 'deactivated'
 
     try:
-        updated = db.source_bulk_update_flag(list(source_ids),
-                                                  active=True)
-        click.echo(f"Successfully activated {updated} sources")
+        updated = db.source_bulk_update_flag(list(source_ids), active=active)
+        for source in updated:
+            post_manager.invalidate_source(source['id'])
+
+        click.echo(f"Successfully {action} {len(updated)} sources")
+        unchanged = len(set(source_ids)) - len(updated)
+        if unchanged:
+            click.echo(f"{unchanged} sources were already {action} or not found")
     except Exception as e:
         traceback.print_exc()
-        click.echo(f"Error activating sources: {str(e)}", err=True)
+        click.echo(f"Error updating sources: {str(e)}", err=True)
+
+@source.command()
+@click.argument('source_ids', nargs=-1, type=int, required=True)
+@click.pass_context
+def activate(ctx, source_ids):
+    """Activate one or more sources by their IDs."""
+    _set_sources_active(ctx, source_ids, active=True)
 
 @source.command()
 @click.argument('source_ids', nargs=-1, type=int, required=True)
 @click.pass_context
 def deactivate(ctx, source_ids):
     """Deactivate one or more sources by their IDs."""
-
-    db = ctx.obj['supabase']
-    try:
-        updated = db.source_bulk_update_flag(list(source_ids),
-                                             active=False)
-        click.echo(f"Successfully deactivated {updated} sources")
-    except Exception as e:
-        traceback.print_exc()
-        click.echo(f"Error deactivating sources: {str(e)}", err=True)
+    _set_sources_active(ctx, source_ids, active=False)
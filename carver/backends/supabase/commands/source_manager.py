@@ -1,11 +1,13 @@
 import json
 import logging
+import traceback
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from carver.generators import ArtifactGeneratorFactory
+from carver.generators import ArtifactGeneratorFactory, BaseArtifactGenerator
 
-from carver.utils import parse_date_filter
+from carver.utils import parse_date_filter, json_dumps
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,9 @@ class SourceManager:
                                source_id: int,
                                batch_size: int = 50,
                                last_modified: Optional[datetime] = None,
-                               spec_id: Optional[int] = None) -> Dict[str, Any]:
+                               spec_id: Optional[int] = None,
+                               spec: Optional[Dict[str, Any]] = None,
+                               generator: Optional[BaseArtifactGenerator] = None) -> Dict[str, Any]:
         """
         Generate knowledge graph for a source using its transcripts.
 
@@ -28,16 +32,20 @@ class SourceManager:
             batch_size: Number of posts to process per batch
             last_modified: Optional timestamp to filter posts
             spec_id: Optional specification ID (will search for active knowledge graph spec if not provided)
+            spec: Optional specification already fetched by the caller, skips the lookup
+            generator: Optional knowledge graph generator to reuse across sources
 
         Returns:
             Dict containing status and results
         """
 
         try:
-            print("In generate knowledge graph")
+            logger.debug(f"Generating knowledge graph for source {source_id}")
 
             # Get or verify spec
-            if spec_id:
+            if spec:
+                specs = [spec]
+            elif spec_id:
                 specs = self.db.specification_search(
                     source_id=source_id,
                     spec_id=spec_id,
@@ -47,67 +55,67 @@ class SourceManager:
                 # Find active knowledge graph spec for this source
                 specs = self.db.specification_search(
                     source_id=source_id,
-                    active=True
+                    active=True,
+                    generator='knowledge_graph'
                 )
-                specs = [s for s in specs
-                        if s['config'].get('generator') == 'knowledge_graph']
 
             if not specs:
                 raise ValueError(f"No active knowledge graph specification found for source {source_id}")
 
-            print(f"Specs found {len(specs)}")
+            logger.debug(f"Specs found {len(specs)}")
 
             spec = specs[0]  # Use first matching spec
 
-            # Get posts with artifacts
-            posts = self.db.post_search_with_artifacts(
-                source_id=source_id,
-                modified_after=last_modified,
-                limit=batch_size
-            )
-
-            print(f"Posts found {len(posts)}")
-            if not posts:
-                return {
-                    'status': 'no_posts',
-                    'message': 'No posts found requiring processing'
-                }
-
+            # Posts are streamed to the generator chunk by chunk. The
+            # first post id links the aggregate graph to a post.
+            post_ids = []
 
-            # Organize artifacts by post
-            artifacts_by_post = {}
-            for post in posts:
-                artifacts_by_post[post['id']] = post.get('artifacts', [])
+            def stream_posts():
+                for chunk in self._iter_posts_with_artifacts(source_id,
+                                                             last_modified,
+                                                             batch_size):
+                    for post in chunk:
+                        post_ids.append(post['id'])
+                        yield post
 
             # Get generator instance
-            generator = ArtifactGeneratorFactory.get_generator('knowledge_graph')
+            if generator is None:
+                generator = ArtifactGeneratorFactory.get_generator('knowledge_graph')
 
-            print("Generator", generator)
+            logger.debug(f"Generator {generator}")
 
             results = generator.generate_bulk(
-                posts=posts,
-                config=spec['config'],
-                existing_map=artifacts_by_post
+                posts=stream_posts(),
+                spec=spec
             )
 
+            logger.debug(f"Posts found {len(post_ids)}")
+            if not post_ids:
+                return {
+                    'status': 'no_posts',
+                    'message': 'No posts found requiring processing'
+                }
+
             if results:
 
                 # Link the aggregrate map to the first post
                 for r in results:
                     r['spec_id'] = spec['id']
-                    r['post_id'] = posts[0]['id']
+                    r['post_id'] = post_ids[0]
 
-                print(json.dumps(results, indent=4))
+                # The graph can be large, only serialize it when it is logged
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(json_dumps(results))
 
                 # Create artifacts
                 artifacts = self.db.artifact_bulk_create(results)
 
-                # Extract stats
-                graph_data = json.loads(results[0]['content'])
+                # Stats are recorded by the generator, no need to parse the graph again
+                graph_stats = results[0]['analysis_metadata']
                 stats = {
-                    'nodes': len(graph_data['nodes']),
-                    'edges': len(graph_data['edges']),
-                    'documents': len(graph_data['metadata']['document_references'])
+                    'nodes': graph_stats['node_count'],
+                    'edges': graph_stats['edge_count'],
+                    'documents': graph_stats['document_count']
                 }
 
                 return {
@@ -127,56 +135,125 @@ class SourceManager:
             logger.error(f"Error generating knowledge graph: {str(e)}")
             raise
 
+    def _iter_posts_with_artifacts(self,
+                                   source_id: int,
+                                   last_modified: Optional[datetime],
+                                   limit: int,
+                                   chunk_size: int = 100):
+        """
+        Yield up to limit posts with their artifacts, most recent first,
+        chunk_size at a time. Only one chunk is held at a time and the
+        post id list of each artifact query stays short.
+        """
+        after_id = None
+        remaining = limit
+        while remaining > 0:
+            chunk = self.db.post_search_with_artifacts(
+                source_id=source_id,
+                modified_after=last_modified,
+                limit=min(chunk_size, remaining),
+                after_id=after_id,
+                descending=True
+            )
+            if not chunk:
+                break
+            yield chunk
+            if len(chunk) < min(chunk_size, remaining):
+                break
+            remaining -= len(chunk)
+            after_id = chunk[-1]['id']
+
+    def _iter_sources(self, project_id: int, page_size: int = 100):
+        """Yield the active sources of a project a page at a time."""
+        after_id = None
+        while True:
+            page = self.db.source_search(
+                project_id=project_id,
+                active=True,
+                fields=['id', 'name'],
+                limit=page_size,
+                after_id=after_id
+            )
+            if not page:
+                break
+            yield page
+            if len(page) < page_size:
+                break
+            after_id = page[-1]['id']
+
     def generate_knowledge_graphs(self,
                                 project_id: int,
                                 batch_size: int = 50,
-                                last_modified: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                                last_modified: Optional[datetime] = None,
+                                max_workers: int = 8) -> List[Dict[str, Any]]:
         """
-        Generate knowledge graphs for all sources in a project.
+        Generate knowledge graphs for all sources in a project. Sources
+        are independent, so they are processed concurrently.
 
         Args:
             project_id: Project ID
             batch_size: Posts to process per batch per source
             last_modified: Optional filter for post modification time
+            max_workers: Maximum number of sources processed at once
 
         Returns:
             List of results for each source
         """
         try:
-            # Get all active sources for project
-            sources = self.db.source_search(
-                project_id=project_id,
-                active=True
-            )
+            # Fetch the knowledge graph specs of all sources in one query.
+            # Specs are ordered newest first, matching the per-source lookup.
+            specs_by_source = {}
+            for spec in self.db.specification_search(project_id=project_id,
+                                                     active=True,
+                                                     generator='knowledge_graph',
+                                                     limit=1000):
+                specs_by_source.setdefault(spec['source_id'], spec)
+
+            # generate_bulk creates its models per call and leaves the global
+            # llama_index Settings alone, so the workers can share one instance
+            generator = ArtifactGeneratorFactory.get_generator('knowledge_graph')
 
-            if not sources:
-                logger.info(f"No active sources found for project {project_id}")
-                return []
-
-            results = []
-            for source in sources:
-                try:
-                    result = self.generate_knowledge_graph(
-                        source_id=source['id'],
-                        batch_size=batch_size,
-                        last_modified=last_modified
-                    )
-                    results.append({
-                        'source_id': source['id'],
-                        'source_name': source['name'],
-                        **result
-                    })
-                except Exception as e:
-                    logger.error(f"Error processing source {source['id']}: {str(e)}")
-                    results.append({
-                        'source_id': source['id'],
-                        'source_name': source['name'],
-                        'status': 'error',
-                        'message': str(e)
-                    })
-                    continue
-
-            return results
+            sources = []
+            results = {}
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                # Sources are submitted page by page, so the first ones
+                # are processed while the rest are still being fetched
+                futures = {}
+                for page in self._iter_sources(project_id):
+                    for source in page:
+                        sources.append(source)
+                        future = executor.submit(self.generate_knowledge_graph,
+                                                 source_id=source['id'],
+                                                 batch_size=batch_size,
+                                                 last_modified=last_modified,
+                                                 spec=specs_by_source.get(source['id']),
+                                                 generator=generator)
+                        futures[future] = source
+
+                if not sources:
+                    logger.info(f"No active sources found for project {project_id}")
+                    return []
+
+                for future in as_completed(futures):
+                    source = futures[future]
+                    try:
+                        result = future.result()
+                        results[source['id']] = {
+                            'source_id': source['id'],
+                            'source_name': source['name'],
+                            **result
+                        }
+                    except Exception as e:
+                        logger.error(f"Error processing source {source['id']}: {str(e)}")
+                        results[source['id']] = {
+                            'source_id': source['id'],
+                            'source_name': source['name'],
+                            'status': 'error',
+                            'message': str(e)
+                        }
+
+            # Keep the results in source order
+            return [results[source['id']] for source in sources]
 
         except Exception as e:
             logger.error(f"Error generating knowledge graphs for project: {str(e)}")
@@ -194,11 +271,12 @@ class SourceManager:
         """
         try:
             # Create update data for each source
+            now = datetime.utcnow().isoformat()
             to_update = [
                 {
                     'id': source_id,
                     'active': True,
-                    'updated_at': datetime.utcnow().isoformat()
+                    'updated_at': now
                 }
                 for source_id in source_ids
             ]
@@ -223,11 +301,12 @@ class SourceManager:
         """
         try:
             # Create update data for each source
+            now = datetime.utcnow().isoformat()
             to_update = [
                 {
                     'id': source_id,
                     'active': False,
-                    'updated_at': datetime.utcnow().isoformat()
+                    'updated_at': now
                 }
                 for source_id in source_ids
             ]
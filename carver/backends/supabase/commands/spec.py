@@ -11,7 +11,7 @@ import click
 
 from tabulate import tabulate
 
-from ..utils.helpers import topological_sort, load_template
+from ..utils.helpers import topological_sort, load_template, table_format_option
 from ..utils import get_spec_config
 from carver.utils import format_datetime, parse_date_filter
 from .artifact_manager import ArtifactManager
@@ -60,10 +60,7 @@ def add(ctx, source_id: int, name: str, description: Optional[str], config: str)
 @click.option('--source-id', type=int, help='Filter by source ID')
 @click.option('--name', help='Filter by name (partial match)')
 @click.option('--active/--inactive', default=True, help='Filter by active status')
-@click.option('--format', 'output_format',
-              type=click.Choice(['table', 'grid', 'pipe', 'orgtbl', 'rst', 'mediawiki', 'html']),
-              default='table',
-              help='Output format')
+@table_format_option(help='Output format')
 @click.pass_context
 def search(ctx, source_id: Optional[int], name: Optional[str],
            active: Optional[bool], output_format: str):
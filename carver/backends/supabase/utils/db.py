@@ -1,15 +1,16 @@
 import os
 import sys
 import json
+import time
 import logging
 
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 from pathlib import Path
 
 from psycopg2.pool import SimpleConnectionPool
 
-from carver.utils import get_config
+from carver.utils import get_config, json_dumps, json_loads, chunks_by_length
 from .helpers import get_supabase_client, chunks
 
 logger = logging.getLogger(__name__)
@@ -18,9 +19,17 @@ __all__ = [
     'SupabaseClient'
 ]
 
+# Source lookups shared between CLI invocations, see source_get
+SOURCE_CACHE_DIR = Path.home() / '.carver' / 'cache' / 'source'
+
 class SupabaseClient:
     _instance = None
 
+    # Disk cache of source rows. Entries are written and read by
+    # source_get(use_cache=True) and removed by every source write.
+    source_cache_dir = SOURCE_CACHE_DIR
+    source_cache_ttl = 60
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -41,7 +50,7 @@ class SupabaseClient:
             user=config('SUPABASE_USER'),
             password=config('SUPABASE_PASSWORD'),
             host=config('SUPABASE_HOST'),
-            port=config('SUPABASE_PORT', default=5432)
+            port=config('SUPABASE_PORT', default=5432, cast=int)
         )
 
     def close_connection(self):
@@ -114,13 +123,56 @@ class SupabaseClient:
         })
 
     # Source methods
-    def source_get(self, source_id: int) -> Dict[str, Any]:
-        """Get a single source by ID"""
+    def source_get(self, source_id: int, use_cache: bool = False) -> Dict[str, Any]:
+        """
+        Get a single source by ID. With use_cache a row cached on disk
+        within source_cache_ttl seconds is returned instead, so it may
+        be slightly stale. Do not use it for read-modify-write.
+        """
+        if use_cache:
+            source = self._read_cached_source(source_id)
+            if source is not None:
+                return source
+
         result = self.client.table('carver_source') \
             .select('*, carver_project!inner(*)') \
             .eq('id', source_id) \
             .execute()
-        return result.data[0] if result.data else None
+        source = result.data[0] if result.data else None
+
+        if use_cache and source:
+            self._write_cached_source(source_id, source)
+        return source
+
+    def _read_cached_source(self, source_id: int) -> Optional[Dict[str, Any]]:
+        """Return the source from the disk cache if it is recent enough"""
+        path = self.source_cache_dir / f"{source_id}.json"
+        try:
+            if (time.time() - path.stat().st_mtime) >= self.source_cache_ttl:
+                return None
+            return json_loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def _write_cached_source(self, source_id: int, source: Dict[str, Any]):
+        """Store a source in the disk cache. Failures are not fatal."""
+        try:
+            self.source_cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.source_cache_dir / f"{source_id}.json"
+            # Write and rename so readers never see a partial file
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json_dumps(source, indent=None))
+            tmp_path.replace(path)
+        except (OSError, TypeError) as e:
+            logger.debug("Could not cache source %s: %s", source_id, e)
+
+    def source_cache_invalidate(self, source_ids):
+        """Remove sources from the disk cache. Failures are not fatal."""
+        for source_id in source_ids:
+            try:
+                (self.source_cache_dir / f"{source_id}.json").unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug("Could not remove cached source %s: %s", source_id, e)
 
     def source_search(self,
                       active: Optional[bool] = None,
@@ -130,8 +182,14 @@ class SupabaseClient:
                       name: Optional[str] = None,
                       updated_since: Optional[datetime] = None,
                       crawled_since: Optional[datetime] = None,
-                      fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Search sources with various filters"""
+                      fields: Optional[List[str]] = None,
+                      limit: Optional[int] = None,
+                      after_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search sources with various filters. With limit or after_id the
+        sources are ordered by id, so the last id seen can be passed as
+        after_id to fetch the next page.
+        """
         # Build the select statement
         if fields:
             # If fields are specified but 'carver_project' isn't in them, add it with basic fields
@@ -158,6 +216,12 @@ class SupabaseClient:
             query = query.gte('updated_at', updated_since.isoformat())
         if crawled_since:
             query = query.gte('last_crawled', crawled_since.isoformat())
+        if after_id is not None:
+            query = query.gt('id', after_id)
+        if limit is not None or after_id is not None:
+            query = query.order('id')
+        if limit is not None:
+            query = query.limit(limit)
 
         result = query.execute()
         return result.data
@@ -173,8 +237,28 @@ class SupabaseClient:
             .update(data) \
             .eq('id', source_id) \
             .execute()
+        self.source_cache_invalidate([source_id])
         return result.data[0] if result.data else None
 
+    def source_bulk_create(self, sources: List[Dict[str, Any]],
+                           chunk_size: int = 100) -> List[Dict[str, Any]]:
+        """
+        Bulk create sources with automatic chunking.
+        Returns list of created sources.
+        """
+        created_sources = []
+
+        for chunk in chunks(sources, chunk_size):
+            try:
+                result = self.client.table('carver_source').insert(chunk).execute()
+                if result.data:
+                    created_sources.extend(result.data)
+            except Exception as e:
+                logger.error(f"Error in bulk create: {str(e)}")
+                continue
+
+        return created_sources
+
     def source_bulk_update(self, sources: List[Dict[str, Any]],
                            chunk_size: int = 100) -> List[Dict[str, Any]]:
         """
@@ -197,23 +281,39 @@ class SupabaseClient:
             except Exception as e:
                 logger.error(f"Error in bulk update: {str(e)}")
                 continue
+            finally:
+                self.source_cache_invalidate(source['id'] for source in chunk)
 
         return updated_sources
 
     def source_bulk_update_flag(self, source_ids: List[int],
-                                active: bool) -> List[Dict[str, Any]]:
-
+                                active: bool,
+                                chunk_size: int = 200) -> List[Dict[str, Any]]:
+        """
+        Set the active flag on sources. Sources that already have the
+        flag are left alone, so only the changed sources are returned.
+        """
         data = {'active': active }
 
-        response = self.client.table('carver_source')\
-                              .update(data)\
-                              .in_('id', source_ids)\
-                              .execute()
-        return response.data
+        updated = []
+        for chunk in chunks(sorted(set(source_ids)), chunk_size):
+            response = self.client.table('carver_source')\
+                                  .update(data)\
+                                  .in_('id', chunk)\
+                                  .neq('active', active)\
+                                  .execute()
+            self.source_cache_invalidate(source['id'] for source in response.data)
+            updated.extend(response.data)
+        return updated
 
-    def source_update_metadata(self, source_id: int, metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Update source's analysis metadata"""
-        current = self.source_get(source_id)
+    def source_update_metadata(self, source_id: int, metadata: Dict[str, Any],
+                               current: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Update source's analysis metadata. Pass the current source row
+        when the caller already has it to skip fetching it again.
+        """
+        if current is None:
+            current = self.source_get(source_id)
         if not current:
             return None
 
@@ -225,50 +325,108 @@ class SupabaseClient:
             'updated_at': datetime.utcnow().isoformat()
         })
 
-    def source_update_analytics(self, source_id: int) -> Optional[Dict[str, Any]]:
+    def source_update_analytics(self, source_id: int,
+                                source: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Update analytics metadata for a source.
 
         Args:
             source_id: ID of the source to update
+            source: The source row, if the caller has already fetched it
 
         Returns:
             Updated source if successful, None otherwise
         """
         try:
-            # Get source analytics
-            result = self.client.rpc('get_source_analytics', {
-                'source_id_param': source_id
-            }).execute()
-
-            if not result.data:
+            analytics_metadata = self._source_analytics_metadata(source_id)
+            if analytics_metadata is None:
                 return None
 
-            metrics = result.data[0]
-
-            # Prepare analytics metadata
-            analytics_metadata = {
-                "metrics": {
-                    'counts': {
-                        'posts': metrics['active_posts_count'],
-                        'artifacts': metrics['active_artifacts_count'],
-                        'specifications': metrics['active_specs_count']
-                    },
-                    'distribution': {
-                        'artifact_spec': metrics['artifact_spec_distribution'],
-                        'artifact_type': metrics['artifact_type_distribution'],
-                        'artifact_status': metrics['artifact_status_distribution']
-                    },
-                    'last_update': datetime.utcnow().isoformat()
-                }
-            }
-
             # Update source metadata
-            return self.source_update_metadata(source_id, analytics_metadata)
+            return self.source_update_metadata(source_id, analytics_metadata,
+                                               current=source)
 
         except Exception as e:
             logger.error(f"Error updating analytics for source {source_id}: {str(e)}")
             raise
+
+    def source_update_analytics_bulk(self, source_ids: List[int],
+                                     chunk_size: int = 200,
+                                     progress: Optional[Callable[[int], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Update analytics metadata for several sources. The stored metadata
+        is read in bulk. The analytics RPC and the write still happen once
+        per source: the write is a PATCH of the merged metadata, since an
+        upsert of partial rows would trip NOT NULL columns on insert.
+        Errors are raised rather than skipped. progress, when given, is
+        called with each source id once that source is done.
+
+        Returns:
+            List of updated sources
+        """
+        try:
+            if not source_ids:
+                return []
+
+            current = []
+            for chunk in chunks(source_ids, chunk_size):
+                result = self.client.table('carver_source') \
+                    .select('id, analysis_metadata') \
+                    .in_('id', chunk) \
+                    .execute()
+                current.extend(result.data)
+
+            now = datetime.utcnow().isoformat()
+            updated = []
+            for source in current:
+                analytics_metadata = self._source_analytics_metadata(source['id'])
+                if analytics_metadata is not None:
+                    existing_metadata = source.get('analysis_metadata') or {}
+                    result = self.source_update(source['id'], {
+                        'analysis_metadata': {**existing_metadata, **analytics_metadata},
+                        'updated_at': now
+                    })
+                    if result:
+                        updated.append(result)
+
+                if progress is not None:
+                    progress(source['id'])
+
+            return updated
+
+        except Exception as e:
+            logger.error(f"Error updating analytics for sources: {str(e)}")
+            raise
+
+    def _source_analytics_metadata(self, source_id: int) -> Optional[Dict[str, Any]]:
+        """Compute the analytics metadata of a source"""
+        # Get source analytics
+        result = self.client.rpc('get_source_analytics', {
+            'source_id_param': source_id
+        }).execute()
+
+        if not result.data:
+            return None
+
+        metrics = result.data[0]
+
+        # Prepare analytics metadata
+        return {
+            "metrics": {
+                'counts': {
+                    'posts': metrics['active_posts_count'],
+                    'artifacts': metrics['active_artifacts_count'],
+                    'specifications': metrics['active_specs_count']
+                },
+                'distribution': {
+                    'artifact_spec': metrics['artifact_spec_distribution'],
+                    'artifact_type': metrics['artifact_type_distribution'],
+                    'artifact_status': metrics['artifact_status_distribution']
+                },
+                'last_update': datetime.utcnow().isoformat()
+            }
+        }
+
     ##########################################################
     # Item Methods
     ##########################################################
@@ -297,7 +455,8 @@ class SupabaseClient:
                     tags_search: Optional[str] = None,
                     fields: Optional[List[str]] = None,
                     limit: int = 20,
-                    offset: int = 0) -> List[Dict[str, Any]]:
+                    offset: int = 0,
+                    return_count: bool = False) -> List[Dict[str, Any]]:
         """
         Search posts with various filters
 
@@ -315,21 +474,26 @@ class SupabaseClient:
             tags_search: Search in tags (partial match)
             limit: Maximum number of posts to return
             offset: Number of posts to skip
+            return_count: Also return the total number of matching posts.
+                The result is then a (posts, total) tuple.
         """
         try:
             # Build the select statement
+            # Only the source name is rendered, so avoid embedding the
+            # full source row for every post
             if fields:
                 # Always include id and ensure no duplicates
                 required_fields = {'id', 'source_id', 'content_identifier'}
-                all_fields = list(required_fields.union(fields))
+                all_fields = list(required_fields.union(fields) - {'carver_source'})
                 select_statement = ', '.join(all_fields)
                 # Add source details if requested
                 if 'carver_source' in fields:
-                    select_statement += ', carver_source(*)'
+                    select_statement += ', carver_source(id, name)'
             else:
-                select_statement = '*, carver_source(*)'
+                select_statement = '*, carver_source(id, name)'
 
-            query = self.client.table('carver_post').select(select_statement)
+            count = 'exact' if return_count else None
+            query = self.client.table('carver_post').select(select_statement, count=count)
 
             if source_id:
                 query = query.eq('source_id', source_id)
@@ -360,6 +524,8 @@ class SupabaseClient:
             query = query.range(offset, offset + limit - 1)
 
             result = query.execute()
+            if return_count:
+                return result.data, result.count
             return result.data
 
         except Exception as e:
@@ -429,29 +595,102 @@ class SupabaseClient:
 
         return updated_posts
 
+    def post_bulk_patch(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Update columns of existing posts by id. Each item holds 'id' and
+        the columns to set. Unlike post_bulk_update this is a PATCH per
+        post, so partial rows do not trip NOT NULL checks on insert.
+        Errors are raised.
+        Returns list of updated posts.
+        """
+        if not all('id' in item for item in posts):
+            raise ValueError("All posts must have 'id' field for bulk update")
+
+        updated_posts = []
+        for item in posts:
+            data = {key: value for key, value in item.items() if key != 'id'}
+            try:
+                result = self.client.table('carver_post') \
+                    .update(data) \
+                    .eq('id', item['id']) \
+                    .execute()
+            except Exception as e:
+                logger.error(f"Error updating post {item['id']}: {str(e)}")
+                raise
+            if result.data:
+                updated_posts.extend(result.data)
+
+        return updated_posts
+
+    def post_bulk_upsert(self, posts: List[Dict[str, Any]],
+                         on_conflict: str = 'source_id,content_identifier',
+                         chunk_size: int = 100) -> List[Dict[str, Any]]:
+        """
+        Bulk insert or update posts in one round trip per chunk. Rows are
+        matched on the on_conflict columns rather than on 'id', so new and
+        changed posts can be written together.
+
+        Requires a unique constraint on carver_post over the on_conflict
+        columns, see the README. Errors are raised rather than logged so
+        a missing constraint does not look like an empty sync.
+        Returns list of written posts.
+        """
+        written_posts = []
+
+        for chunk in chunks(posts, chunk_size):
+            try:
+                result = self.client.table('carver_post') \
+                    .upsert(chunk, on_conflict=on_conflict) \
+                    .execute()
+            except Exception as e:
+                logger.error(f"Error in bulk upsert: {str(e)}")
+                raise
+            if result.data:
+                written_posts.extend(result.data)
+
+        return written_posts
+
     def post_bulk_update_flag(self, post_ids: List[int],
-                              active: bool) -> List[Dict[str, Any]]:
+                              active: bool,
+                              chunk_size: int = 200) -> List[Dict[str, Any]]:
 
         data = {'active': active }
 
-        response = self.client.table('carver_post')\
-                              .update(data)\
-                              .in_('id', post_ids)\
-                              .execute()
+        updated = []
+        for chunk in chunks(post_ids, chunk_size):
+            response = self.client.table('carver_post')\
+                                  .update(data)\
+                                  .in_('id', chunk)\
+                                  .execute()
+            updated.extend(response.data)
 
-        return response.data
+        return updated
+
+    def post_bulk_update_flag_by_content(self, source_id: int,
+                                         content_identifiers: List[str],
+                                         active: bool,
+                                         chunk_size: int = 200) -> List[Dict[str, Any]]:
+        """
+        Set the active flag on posts of a source by content identifier.
+        The filter runs server side so the posts are not read first.
+        """
+        data = {'active': active }
+
+        updated = []
+        for chunk in chunks_by_length(content_identifiers, max_items=chunk_size):
+            response = self.client.table('carver_post')\
+                                  .update(data)\
+                                  .eq('source_id', source_id)\
+                                  .in_('content_identifier', chunk)\
+                                  .execute()
+            updated.extend(response.data)
+
+        return updated
 
     def post_bulk_activate(self, source_id: int, content_identifiers: List[str]) -> List[Dict[str, Any]]:
         """Activate posts by their content identifiers"""
         try:
-            # First get the posts to update
-            posts = self.post_search(
-                source_id=source_id,
-                content_identifier=content_identifiers
-            )
-            post_ids = [p['id'] for p in posts]
-
-            return self.post_bulk_update_flag(post_ids, active=True)
+            return self.post_bulk_update_flag_by_content(source_id, content_identifiers, active=True)
         except Exception as e:
             logger.error(f"Error in bulk activate: {str(e)}")
             raise
@@ -459,19 +698,7 @@ class SupabaseClient:
     def post_bulk_deactivate(self, source_id: int, content_identifiers: List[str]) -> List[Dict[str, Any]]:
         """Deactivate posts by their content identifiers"""
         try:
-            # First get the posts to update
-            posts = self.post_search(
-                source_id=source_id,
-                content_identifier=content_identifiers
-            )
-
-            posts = self.post_search(
-                source_id=source_id,
-                content_identifier=content_identifiers
-            )
-            post_ids = [p['id'] for p in posts]
-
-            return self.post_bulk_update_flag(post_ids, active=False)
+            return self.post_bulk_update_flag_by_content(source_id, content_identifiers, active=False)
         except Exception as e:
             logger.error(f"Error in bulk deactivate: {str(e)}")
             raise
@@ -521,10 +748,16 @@ class SupabaseClient:
                                    generator_name: Optional[str] = None,
                                    modified_after: Optional[datetime] = None,
                                    offset: int = 0,
-                                   limit: int = 10) -> Dict[int, Dict]:
+                                   limit: int = 10,
+                                   after_id: Optional[int] = None,
+                                   descending: bool = False) -> Dict[int, Dict]:
         """
         Find posts with their artifacts for a specific generator
         Returns a map of post_id -> {post: post_data, artifacts: [artifact_data]}
+
+        Posts are ordered by id, newest first when descending. Pass the
+        last id seen as after_id to page through them without the cost
+        of a large offset.
         """
         try:
             # Get active posts from source
@@ -535,8 +768,10 @@ class SupabaseClient:
 
             if modified_after:
                 query = query.gte('updated_at', modified_after.isoformat())
+            if after_id is not None:
+                query = query.lt('id', after_id) if descending else query.gt('id', after_id)
 
-            query  = query.range(offset, offset + limit - 1)
+            query  = query.order('id', desc=descending).range(offset, offset + limit - 1)
             result = query.execute()
             posts  = result.data
 
@@ -641,6 +876,7 @@ class SupabaseClient:
                           active: Optional[bool] = None,
                           created_since: Optional[datetime] = None,
                           updated_since: Optional[datetime] = None,
+                          generator: Optional[str] = None,
                           limit: int = 100,
                           offset: int = 0,
                           fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
@@ -649,9 +885,10 @@ class SupabaseClient:
             # Build select statement
             if fields:
                 field_list = fields.copy()
-                # If fields are specified but related tables aren't included, add minimal fields
+                # If fields are specified but related tables aren't included, add minimal fields.
+                # The join is inner so that the project filter applies to the specs.
                 if 'carver_source' not in field_list:
-                    field_list.append('carver_source(id, name, carver_project(id, name))')
+                    field_list.append('carver_source!inner(id, name, project_id, carver_project(id, name))')
                 select_statement = ', '.join(field_list)
             else:
                 select_statement = '*, carver_source!inner(*, carver_project!inner(*))'
@@ -672,6 +909,8 @@ class SupabaseClient:
                 query = query.gte('created_at', created_since.isoformat())
             if updated_since:
                 query = query.gte('updated_at', updated_since.isoformat())
+            if generator:
+                query = query.eq('config->>generator', generator)
 
             query = query.order('created_at', desc=True).range(offset, offset + limit - 1)
 
@@ -714,6 +953,9 @@ class SupabaseClient:
     def specification_bulk_activate(self, spec_ids: List[int]) -> List[Dict[str, Any]]:
         """Activate multiple specifications"""
         try:
+            if not spec_ids:
+                return []
+
             updates = [{
                 'id': spec_id,
                 'active': True,
@@ -730,6 +972,9 @@ class SupabaseClient:
     def specification_bulk_deactivate(self, spec_ids: List[int]) -> List[Dict[str, Any]]:
         """Deactivate multiple specifications"""
         try:
+            if not spec_ids:
+                return []
+
             updates = [{
                 'id': spec_id,
                 'active': False,
@@ -826,7 +1071,6 @@ class SupabaseClient:
             if status:
                 query = query.eq('status', status)
             if active is not None:
-                print("active")
                 query = query.eq('active', active)
             if format:
                 query = query.eq('format', format)
@@ -886,16 +1130,20 @@ class SupabaseClient:
         return created
 
     def artifact_bulk_update_flag(self, artifact_ids: List[int],
-                                  active: bool) -> List[Dict[str, Any]]:
+                                  active: bool,
+                                  chunk_size: int = 200) -> List[Dict[str, Any]]:
 
         data = {'active': active }
 
-        response = self.client.table('carver_artifact')\
-                              .update(data)\
-                              .in_('id', artifact_ids)\
-                              .execute()
+        updated = []
+        for chunk in chunks(artifact_ids, chunk_size):
+            response = self.client.table('carver_artifact')\
+                                  .update(data)\
+                                  .in_('id', chunk)\
+                                  .execute()
+            updated.extend(response.data)
 
-        return response.data
+        return updated
 
 
     def artifact_bulk_update_chunked(self, artifacts: List[Dict[str, Any]],
@@ -916,7 +1164,7 @@ class SupabaseClient:
 
         for chunk in chunks(artifacts, chunk_size):
             try:
-                result = self.artifact_bulk_update(self, chunk)
+                updated.extend(self.artifact_bulk_update(chunk))
             except Exception as e:
                 logger.error(f"Error in bulk update artifacts: {str(e)}")
                 continue
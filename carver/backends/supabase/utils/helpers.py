@@ -7,8 +7,11 @@ from typing import List, Dict, Any
 from collections import defaultdict
 from datetime import datetime, timedelta
 import importlib.util
+from functools import lru_cache
 
-from supabase import create_client, Client
+import click
+from supabase import create_client, Client, ClientOptions
+from tabulate import tabulate
 
 from carver.utils import get_config, parse_date_filter, chunks, format_datetime
 
@@ -17,12 +20,26 @@ thisdir = os.path.dirname(__file__)
 __all__ = [
     'get_supabase_client',
     'topological_sort',
+    'topological_levels',
     'hyperlink',
     'get_spec_config',
     'load_template',
-    'format_dependency_tree'
+    'format_dependency_tree',
+    'echo_table',
+    'table_format_option'
 ]
 
+# Line oriented formats where each row can be rendered on its own
+STREAMABLE_FORMATS = ('pipe', 'orgtbl')
+
+TABLE_FORMATS = ('table', 'grid', 'pipe', 'orgtbl', 'rst', 'mediawiki', 'html')
+TABLE_FORMAT_CHOICE = click.Choice(TABLE_FORMATS)
+
+def table_format_option(default: str = 'table', help: str = 'Output format for the table'):
+    """Shared --format option for commands that render tables."""
+    return click.option('--format', 'output_format', type=TABLE_FORMAT_CHOICE,
+                        default=default, help=help)
+
 def get_supabase_client() -> Client:
     """Initialize Supabase client using credentials from config file."""
 
@@ -30,7 +47,23 @@ def get_supabase_client() -> Client:
     supabase_url = config('SUPABASE_URL')
     supabase_key = config('SUPABASE_KEY')
 
-    return create_client(supabase_url, supabase_key)
+    # The PostgREST client keeps one keep-alive HTTP session for the life
+    # of the client, so a single instance should be shared (see
+    # SupabaseClient) rather than created per command.
+    options = ClientOptions(
+        postgrest_client_timeout=config('SUPABASE_TIMEOUT', default=120, cast=int)
+    )
+
+    return create_client(supabase_url, supabase_key, options=options)
+
+def spec_dependencies(spec):
+    """Return the ids a specification depends on as a tuple."""
+    dependencies = (spec.get('config') or {}).get('dependencies', [])
+    if isinstance(dependencies, int):
+        dependencies = [dependencies]
+    elif isinstance(dependencies, str):
+        dependencies = [int(dependencies)]
+    return tuple(dependencies)
 
 def build_dependency_graph(specs):
     """Build a graph of specification dependencies."""
@@ -38,20 +71,23 @@ def build_dependency_graph(specs):
 
     specs = sorted(specs, key=lambda x: x['id'])
     for spec in specs:
-        spec_id = spec['id']
-        dependencies = spec.get('config', {}).get('dependencies', [])
-        if isinstance(dependencies, int):
-            dependencies = [dependencies]
-        elif isinstance(dependencies, str):
-            dependencies = [int(dependencies)]
-        graph[spec_id] = dependencies
+        graph[spec['id']] = list(spec_dependencies(spec))
 
     return graph
 
 def topological_sort(specs):
     """Sort specifications based on dependencies."""
 
-    graph = build_dependency_graph(specs)
+    # The order only depends on the (id, dependencies) edges, so reruns
+    # over an unchanged spec set are served from the cache
+    edges = tuple(sorted((spec['id'], spec_dependencies(spec)) for spec in specs))
+    return list(_topological_order(edges))
+
+@lru_cache(maxsize=32)
+def _topological_order(edges):
+    graph = defaultdict(list)
+    for spec_id, dependencies in edges:
+        graph[spec_id] = list(dependencies)
 
     def visit(node, visited, temp_mark, order, graph):
         if node in temp_mark:
@@ -71,7 +107,26 @@ def topological_sort(specs):
         if node not in visited:
             visit(node, visited, temp_mark, order, graph)
 
-    return order
+    return tuple(order)
+
+def topological_levels(specs):
+    """
+    Group specifications into dependency levels. Every spec depends only
+    on specs of earlier levels, so specs of one level can be processed
+    in any order, or concurrently.
+    """
+    dependencies = {spec['id']: spec_dependencies(spec) for spec in specs}
+
+    depth = {}
+    for spec_id in topological_sort(specs):
+        depth[spec_id] = 1 + max((depth.get(dep, -1) for dep in dependencies.get(spec_id, ())),
+                                 default=-1)
+
+    levels = defaultdict(list)
+    for spec_id in dependencies:
+        levels[depth[spec_id]].append(spec_id)
+
+    return [sorted(levels[level]) for level in sorted(levels)]
 
 
 def hyperlink(uri, label=None):
@@ -217,3 +272,32 @@ def format_dependency_tree(specs: list, indent: str = "") -> list:
 
     return formatted
 
+def echo_table(rows, headers: list, tablefmt: str = 'table', **kwargs) -> int:
+    """
+    Render rows with tabulate and echo them. For line oriented formats
+    the rows are written as they are produced instead of building the
+    whole table first. Returns the number of rows written.
+    """
+    if tablefmt not in STREAMABLE_FORMATS:
+        rows = list(rows)
+        click.echo(tabulate(rows, headers=headers, tablefmt=tablefmt, **kwargs))
+        return len(rows)
+
+    # Rows are rendered one at a time, so column types cannot be
+    # inferred across rows. Treat every cell as text so that the
+    # alignment declared under the header holds for all rows.
+    kwargs.setdefault('disable_numparse', True)
+
+    click.echo(tabulate([], headers=headers, tablefmt=tablefmt, **kwargs))
+    count = 0
+    for row in rows:
+        # A row must stay on one line, or only its last line is kept
+        row = [' '.join(str(cell).splitlines()) if isinstance(cell, str) else cell
+               for cell in row]
+        # Rendering with the headers pads each cell to at least the
+        # header width, so rows line up with the header. Only the last
+        # line is the row itself.
+        click.echo(tabulate([row], headers=headers, tablefmt=tablefmt,
+                            **kwargs).splitlines()[-1])
+        count += 1
+    return count
@@ -44,6 +44,16 @@ class SourceURLParser:
         'search': r'(?:https?:\/\/)?([a-zA-Z0-9-]+)\.exa\.ai\/?$',
     }
 
+    # Parsers for known hosts, keyed by registered domain. These are
+    # tried before the generic parsers, which fetch the URL to probe it.
+    HOST_PARSERS = {
+        'youtube.com': '_parse_youtube',
+        'github.com': '_parse_github',
+        'substack.com': '_parse_substack',
+        'reddit.com': '_parse_reddit',
+        'exa.ai': '_parse_exa',
+    }
+
     @classmethod
     def parse_url(cls, url: str) -> Optional[Dict]:
         """
@@ -68,6 +78,15 @@ class SourceURLParser:
                 cls._parse_exa
             ]
 
+            # Dispatch known hosts straight to their parser. The full
+            # chain is still tried if it does not recognize the URL.
+            domain = '.'.join((parsed.hostname or '').split('.')[-2:])
+            host_parser = cls.HOST_PARSERS.get(domain)
+            if host_parser:
+                parser = getattr(cls, host_parser)
+                parsers.remove(parser)
+                parsers.insert(0, parser)
+
             for parser in parsers:
                 try:
                     result = parser(url, parsed)
@@ -1,6 +1,14 @@
 from .base import *
-from .youtube import *
-from .github import *
-from .podcast import *
-from .rss import *
 
+# The readers pull in heavy clients (googleapiclient, feedparser, ...).
+# FeedReader.get_reader imports them on demand, and the names below are
+# resolved on first access so importing carver.feeds stays cheap.
+_LAZY_MODULES = ('youtube', 'github', 'podcast', 'rss')
+
+def __getattr__(name):
+    import importlib
+    for modname in _LAZY_MODULES:
+        module = importlib.import_module(f'.{modname}', __name__)
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,7 @@ from datetime import datetime
 
 from decouple import Config
 
-from ..utils import get_config
+from ..utils import get_config, normalize_timestamp
 
 class FeedReader(ABC):
     """Base class for all feed readers"""
@@ -37,6 +37,7 @@ class FeedReader(ABC):
             'active': True,
             'content_identifier': self.get_content_identifier(raw_item),
             'acquired_at': now,
+            'created_at': now,
             'updated_at': now,
             'is_processed': False,
             "language": "en",
@@ -45,6 +46,23 @@ class FeedReader(ABC):
             # Language will be set by specific readers based on content
         }
 
+    def normalize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fill in the name column, truncate values to the column sizes and
+        convert published_at to the UTC form the database returns
+        """
+        item['published_at'] = normalize_timestamp(item.get('published_at'))
+
+        title = item['title']
+        item['name'] = (item.get('name') or title)[:255]
+        item['title'] = title[:500]
+
+        author = item.get('author')
+        if author and len(author) > 255:
+            item['author'] = author[:255]
+
+        return item
+
     @classmethod
     def get_reader(cls, source: Dict[str, Any], max_results: Optional[int] = None) -> 'FeedReader':
         """Factory method to get appropriate reader for source"""
@@ -81,9 +99,10 @@ class FeedReader(ABC):
 
     def update_source_metadata(self, db_client) -> Dict[str, Any]:
         """Update source metadata after successful feed read"""
+        now = datetime.utcnow().isoformat()
         metadata_update = {
             'id': self.source['id'],
-            'last_crawled': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
+            'last_crawled': now,
+            'updated_at': now
         }
         return db_client.source_update(self.source['id'], metadata_update)
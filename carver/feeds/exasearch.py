@@ -4,12 +4,14 @@ import json
 import logging
 import traceback
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from datetime import datetime, timezone
 from dataclasses import dataclass, asdict
 
-from exa_py import Exa
-from exa_py.api import Result
+# exa_py (and the openai package it pulls in) is slow to import, so it
+# is loaded when a reader is created rather than at CLI startup
+if TYPE_CHECKING:
+    from exa_py.api import Result
 
 from carver.utils import get_config, parse_date_filter
 from .base import FeedReader
@@ -25,13 +27,14 @@ class ExaReader(FeedReader):
         if not api_key:
             raise ValueError("Exa API key not found in source config")
 
+        from exa_py import Exa
         self.exa = Exa(api_key=api_key)
 
     def get_content_identifier(self, item: Dict[str, Any]) -> str:
         """Get unique identifier for an item"""
         return item['id']
 
-    def prepare_item(self, raw_item: Result) -> Dict[str, Any]:
+    def prepare_item(self, raw_item: 'Result') -> Dict[str, Any]:
         """Convert Exa API response to database item"""
 
         base_item = super().prepare_item(asdict(raw_item))
@@ -76,7 +79,8 @@ class ExaSearchReader(ExaReader):
         # Calculate max results (default to 50 if not specified)
         max_results = self.source['config'].get('num_results', 25)
         if self.max_results and max_results != self.max_results:
-            print(f"Overriding default num_results ({max_results}) with {self.max_results}")
+            logger.info("Overriding default num_results (%s) with %s",
+                        max_results, self.max_results)
             max_results = min(self.max_results, 30)
 
         extra = {}
@@ -84,7 +88,7 @@ class ExaSearchReader(ExaReader):
             extra['category'] = self.source['config']['category']
 
         _type = self.source['config'].get('type', 'neural')
-        print("_type", _type)
+        logger.debug("Exa search type %s", _type)
         try:
             response = self.exa.search(
                 query,
@@ -111,7 +115,8 @@ class ExaSearchReader(ExaReader):
                 final_items.append(item)
 
             if skipped > 0:
-                print(f"Skipped {skipped} items due overlap with {domain_exclude}")
+                logger.info("Skipped %d items due overlap with %s",
+                            skipped, domain_exclude)
 
             return final_items
 
@@ -7,9 +7,6 @@ from typing import List, Dict, Any, Optional, Type
 from datetime import datetime
 from abc import ABC, abstractmethod
 
-from exa_py import Exa
-from exa_py.api import Result
-
 from .base import BaseArtifactGenerator
 
 from carver.utils import get_config
@@ -26,6 +23,8 @@ class ExaContentGenerator(BaseArtifactGenerator):
         api_key = get_config()('EXA_API_KEY')
         if not api_key:
             raise ValueError("Exa API key not found in config")
+
+        from exa_py import Exa
         self.exa = Exa(api_key=api_key)
 
     def get_ids(self, config: Dict[str, Any]):
@@ -1,21 +1,17 @@
 import os
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, TYPE_CHECKING
 from collections import defaultdict
 from datetime import datetime
 
-from llama_index.core import (
-    Document,
-    KnowledgeGraphIndex,
-    Settings,
-)
-from llama_index.core.graph_stores import SimpleGraphStore
-from llama_index.core.storage.storage_context import StorageContext
-from llama_index.llms.openai import OpenAI
+# llama_index takes about a second to import, so it is only loaded
+# when a knowledge graph is actually generated
+if TYPE_CHECKING:
+    from llama_index.core import Document
 
 from .base import BaseArtifactGenerator
-from carver.utils import get_config
+from carver.utils import get_config, json_dumps
 
 logger = logging.getLogger(__name__)
 
@@ -52,8 +48,10 @@ class KnowledgeGraphGenerator(BaseArtifactGenerator):
                 return artifact['content']
         return None
 
-    def _prepare_document(self, post: Dict[str, Any], transcript: str) -> Document:
+    def _prepare_document(self, post: Dict[str, Any], transcript: str) -> 'Document':
         """Create document with metadata from post"""
+        from llama_index.core import Document
+
         return Document(
             text=transcript,
             metadata={
@@ -72,13 +70,22 @@ class KnowledgeGraphGenerator(BaseArtifactGenerator):
         """Generate artifact content from post data"""
         raise Exception("Not implemented")
 
-    def generate_bulk(self, posts: List[Dict[str, Any]],
+    def generate_bulk(self, posts: Iterable[Dict[str, Any]],
                      spec: Dict[str, Any],
-                     existing_map: Dict[int, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
-        """Generate knowledge graph from multiple posts"""
-
-        llmconfig = get_config()
-        os.environ['OPENAI_API_KEY'] = llmconfig('OPENAI_API_KEY')
+                     existing_map: Optional[Dict[int, List[Dict[str, Any]]]] = None) -> List[Dict[str, Any]]:
+        """
+        Generate knowledge graph from multiple posts. posts is read once
+        and may be a generator, so only the documents are kept. Without
+        existing_map the artifacts are taken from each post.
+        """
+        from llama_index.core import KnowledgeGraphIndex
+        from llama_index.core.graph_stores import SimpleGraphStore
+        from llama_index.core.node_parser import SentenceSplitter
+        from llama_index.core.storage.storage_context import StorageContext
+        from llama_index.embeddings.openai import OpenAIEmbedding
+        from llama_index.llms.openai import OpenAI
+
+        api_key = get_config()('OPENAI_API_KEY')
 
         config = spec['config']
 
@@ -87,35 +94,41 @@ class KnowledgeGraphGenerator(BaseArtifactGenerator):
             graph_store = SimpleGraphStore()
             storage_context = StorageContext.from_defaults(graph_store=graph_store)
 
-            # Configure LlamaIndex settings
-            try:
-                # Try new style Settings
-                Settings.llm = OpenAI(model="gpt-4o-mini", system_prompt=config['system_prompt'])
-                Settings.chunk_size = 512
-                Settings.chunk_overlap = 20
-            except Exception as e:
-                logger.warning(f"Falling back to legacy settings: {e}")
-                # Fall back to legacy style settings through ServiceContext
-                from llama_index.core import ServiceContext
-                service_context = ServiceContext.from_defaults(
-                    llm=OpenAI(model="gpt-4o-mini", system_prompt=config['system_prompt']),
-                    chunk_size=512,
-                    chunk_overlap=20
-                )
+            # The models are passed to the index instead of being set on the
+            # global llama_index Settings, so concurrent builds for different
+            # specs do not pick up each other's system prompt
+            llm = OpenAI(model="gpt-4o-mini",
+                         system_prompt=config['system_prompt'],
+                         api_key=api_key)
+            embed_model = OpenAIEmbedding(api_key=api_key)
+            splitter = SentenceSplitter(chunk_size=512, chunk_overlap=20)
 
             # Prepare documents with metadata
             documents = []
             doc_map = {}  # Track document sources
+            document_references = {}
+            post_count = 0
 
             # Process each post
             for post in posts:
-                post_artifacts = existing_map.get(post['id'], [])
+                post_count += 1
+                if existing_map is not None:
+                    post_artifacts = existing_map.get(post['id'], [])
+                else:
+                    post_artifacts = post.get('artifacts') or []
                 transcript = self._get_transcript(post, post_artifacts)
 
                 if transcript:
                     doc = self._prepare_document(post, transcript)
                     documents.append(doc)
                     doc_map[doc.doc_id] = post['id']
+                    document_references[post['id']] = {
+                        'title': post.get('title', ''),
+                        'url': post.get('url', ''),
+                        'published_at': post.get('published_at'),
+                        'content_type': post.get('content_type'),
+                        'source_id': post.get('source_id')
+                    }
 
             if not documents:
                 logger.info("No documents to process")
@@ -126,6 +139,9 @@ class KnowledgeGraphGenerator(BaseArtifactGenerator):
             kg_index = KnowledgeGraphIndex.from_documents(
                 documents,
                 storage_context=storage_context,
+                transformations=[splitter],
+                llm=llm,
+                embed_model=embed_model,
                 max_triplets_per_chunk=5, #config.get('max_triplets_per_chunk', 10),
                 include_embeddings=False, #config.get('include_embeddings', True)
             )
@@ -206,17 +222,7 @@ class KnowledgeGraphGenerator(BaseArtifactGenerator):
             graph_data["nodes"] = list(node_map.values())
 
             # Add document metadata
-            graph_data["metadata"]["document_references"] = {
-                post['id']: {
-                    'title': post.get('title', ''),
-                    'url': post.get('url', ''),
-                    'published_at': post.get('published_at'),
-                    'content_type': post.get('content_type'),
-                    'source_id': post.get('source_id')
-                }
-                for post in posts
-                if any(doc.metadata.get('post_id') == post['id'] for doc in documents)
-            }
+            graph_data["metadata"]["document_references"] = document_references
 
             # Calculate statistics
             node_count = len(graph_data["nodes"])
@@ -230,8 +236,8 @@ class KnowledgeGraphGenerator(BaseArtifactGenerator):
                 'name': "Knowledge Graph",
                 'generator_name': self.name,
                 'generator_id': 'en',
-                'title': f"Knowledge Graph: {len(posts)} Documents",
-                'content': json.dumps(graph_data, indent=2),
+                'title': f"Knowledge Graph: {post_count} Documents",
+                'content': json_dumps(graph_data),
                 'format': 'json',
                 'artifact_type': 'KNOWLEDGE_GRAPH',
                 'active': True,
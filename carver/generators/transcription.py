@@ -6,10 +6,6 @@ from typing import List, Dict, Any, Optional, Type
 from datetime import datetime
 from abc import ABC, abstractmethod
 
-from youtube_transcript_api import YouTubeTranscriptApi
-from exa_py import Exa
-from exa_py.api import Result
-
 from carver.utils import get_config, SafeEncoder
 
 from .base import BaseArtifactGenerator
@@ -28,12 +24,16 @@ class TranscriptionGenerator(BaseArtifactGenerator):
         api_key = get_config()('EXA_API_KEY')
         if not api_key:
             raise ValueError("Exa API key not found in config")
+
+        from exa_py import Exa
         self.exa = Exa(api_key=api_key)
 
     def get_transcripts(self, youtube_id, languages=['en', 'en-GB']) -> Dict[str, Any]:
         """
         Generate or process transcription from content
         """
+        from youtube_transcript_api import YouTubeTranscriptApi
+
         print(f"[{self.name} {youtube_id} getting transcripts for", youtube_id, languages)
         transcript_list = YouTubeTranscriptApi.list_transcripts(youtube_id)
         available_languages = list(set([transcript.language_code for transcript in transcript_list]))
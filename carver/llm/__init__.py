@@ -4,21 +4,27 @@ import json
 
 from typing import List
 
-import openai
-
 from carver.utils import get_config
 __all__ = [
     'run_llm_summarize',
     'run_openai_summarize',
-    'get_embedding'
+    'get_embedding',
+    'get_embeddings'
 ]
 
-def run_openai_summarize(system_prompt, user_prompt):
+def _get_client():
+    """
+    Create an OpenAI client. openai is slow to import, so it is only
+    loaded once a request is made.
+    """
+    import openai
 
     config = get_config()
-    api_key = config('OPENAI_API_KEY')
+    return openai.OpenAI(api_key=config('OPENAI_API_KEY'))
+
+def run_openai_summarize(system_prompt, user_prompt):
 
-    client = openai.OpenAI(api_key=api_key)
+    client = _get_client()
     response = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
@@ -42,10 +48,7 @@ def run_llm_summarize(system_prompt, user_prompt):
 
 def get_embedding(text: str, model: str = "text-embedding-3-small") -> List[float]:
     """Get embedding vector from OpenAI API"""
-    config = get_config()
-    api_key = config('OPENAI_API_KEY')
-
-    client = openai.OpenAI(api_key=api_key)
+    client = _get_client()
     response = client.embeddings.create(
         model=model,
         input=text,
@@ -53,3 +56,18 @@ def get_embedding(text: str, model: str = "text-embedding-3-small") -> List[floa
     )
 
     return response.data[0].embedding
+
+def get_embeddings(texts: List[str], model: str = "text-embedding-3-small") -> List[List[float]]:
+    """Get embedding vectors for several texts with one OpenAI API request"""
+    if not texts:
+        return []
+
+    client = _get_client()
+    response = client.embeddings.create(
+        model=model,
+        input=texts,
+        encoding_format="float"
+    )
+
+    data = sorted(response.data, key=lambda d: d.index)
+    return [d.embedding for d in data]
@@ -1,20 +1,33 @@
 import os
 import sys
+import re
 import json
+import time
+from urllib.parse import quote
 
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from decouple import Config, RepositoryIni
 from dateutil import parser
 
+try:
+    import orjson
+except ImportError: # pragma: no cover
+    orjson = None
+
 __all__ = [
     'get_config',
     'flatten',
     'parse_date_filter',
     'chunks',
+    'chunks_by_length',
     'format_datetime',
+    'normalize_timestamp',
+    'json_dumps',
+    'json_loads',
 ]
 
 # Configuration file locations to search
@@ -91,31 +104,128 @@ class SafeEncoder(json.JSONEncoder):
 
         return result
 
+def json_dumps(data: Any, indent: Optional[int] = 2) -> str:
+    """
+    Serialize data for display. Uses orjson when it is installed and
+    falls back to the standard library otherwise.
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(data, indent=indent)
+
+def json_loads(text: str) -> Any:
+    """
+    Parse JSON text. Uses orjson when it is installed. Both parsers
+    raise json.JSONDecodeError on invalid input.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+# ISO-8601 timestamps as returned by Postgres, e.g. 2024-01-31T10:15:00+00:00
+ISO_DATETIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}')
+
 def format_datetime(dt_str: str) -> str:
     """Format datetime string for display"""
+    # The display format is a prefix of the ISO form, so slice it
+    # instead of parsing. dateutil handles everything else.
+    if ISO_DATETIME_RE.match(dt_str):
+        return f"{dt_str[:10]} {dt_str[11:16]}"
+    return _format_parsed_datetime(dt_str)
+
+@lru_cache(maxsize=2048)
+def _format_parsed_datetime(dt_str: str) -> str:
+    """Format a non-ISO datetime string. Parsing is slow, so results are cached."""
     dt = parser.parse(dt_str)
     return dt.strftime('%Y-%m-%d %H:%M')
 
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """
+    Convert a timestamp to an ISO-8601 string in UTC, the form Postgres
+    returns for timestamptz columns. Values that cannot be parsed are
+    returned unchanged.
+    """
+    if value is None or value == '':
+        return None
+
+    try:
+        if isinstance(value, time.struct_time):
+            dt = datetime(*value[:6], tzinfo=timezone.utc)
+        elif isinstance(value, datetime):
+            dt = value
+        else:
+            try:
+                dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                dt = parser.parse(value)
+    except (ValueError, OverflowError, TypeError):
+        return value
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+# Relative date filters such as "2h", "1d", "1w" or "3m" (months)
+RELATIVE_DATE_RE = re.compile(r'^(\d+)([hdwm])$')
+
+RELATIVE_DATE_UNITS = {
+    'h': lambda n: timedelta(hours=n),
+    'd': lambda n: timedelta(days=n),
+    'w': lambda n: timedelta(weeks=n),
+    'm': lambda n: timedelta(weeks=n*4),
+}
+
 def parse_date_filter(date_str: str) -> datetime:
     """Parse date filter string into datetime object"""
-    if date_str.endswith('h'):
-        hours = int(date_str[:-1])
-        return datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=hours)
-    elif date_str.endswith('d'):
-        days = int(date_str[:-1])
-        return datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(days=days)
-    elif date_str.endswith('w'):
-        weeks = int(date_str[:-1])
-        return datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(weeks=weeks)
-    elif date_str.endswith('m'):
-        months = int(date_str[:-1])
-        return datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(weeks=months*4)
-    else:
-        return parser.parse(date_str)
+    delta = _relative_delta(date_str)
+    if delta is not None:
+        return datetime.utcnow().replace(minute=0, second=0, microsecond=0) - delta
+
+    return _parse_absolute_date(date_str)
+
+@lru_cache(maxsize=128)
+def _relative_delta(date_str: str) -> Optional[timedelta]:
+    """Map a relative filter such as "1d" to its timedelta, None if it is not one."""
+    match = RELATIVE_DATE_RE.match(date_str)
+    if not match:
+        return None
+    return RELATIVE_DATE_UNITS[match.group(2)](int(match.group(1)))
+
+@lru_cache(maxsize=256)
+def _parse_absolute_date(date_str: str) -> datetime:
+    """Parse an absolute date. Relative filters depend on the current time and are not cached."""
+    return parser.parse(date_str)
 
 def chunks(lst: List[Any], n: int) -> List[List[Any]]:
     """Yield successive n-sized chunks from lst."""
     for i in range(0, len(lst), n):
         yield lst[i:i + n]
 
+def chunks_by_length(values: List[Any], max_length: int = 4000,
+                     max_items: int = 200) -> List[List[Any]]:
+    """
+    Yield chunks of values for an in.(...) filter whose URL-encoded size
+    stays within max_length characters. Identifiers such as URLs vary a
+    lot in length, so a fixed count can exceed the URL limits of proxies.
+    """
+    chunk = []
+    length = 0
+    for value in values:
+        # Encoded value plus the quotes and comma PostgREST adds
+        size = len(quote(str(value), safe='')) + 3
+        if chunk and (length + size > max_length or len(chunk) >= max_items):
+            yield chunk
+            chunk = []
+            length = 0
+        chunk.append(value)
+        length += size
+    if chunk:
+        yield chunk
+
 